@@ -0,0 +1,47 @@
+import asyncio
+import supervisor
+
+from adafruit_ticks import ticks_diff
+
+from app import const
+from app.shared import log
+
+
+class _Boot:
+    # duration of each stage is measured from the end of the previous one;
+    # stages needed for the idle screen are run first, and the slow ones
+    # are run in the background after the first frame is shown
+    def __init__(self) -> None:
+        self.stages = []
+        self.ready = asyncio.Event()
+        self._timestamp = supervisor.ticks_ms()
+
+    def stage(self, name: str) -> None:
+        now = supervisor.ticks_ms()
+        self.stages.append((name, ticks_diff(now, self._timestamp)))
+        self._timestamp = now
+
+    async def pause(self) -> None:
+        # a single yield would not be enough for the menu to handle its timers
+        # and draw the frame; the pause is not included in the stage durations
+        await asyncio.sleep(1 / const.FRAME_RATE)
+        self._timestamp = supervisor.ticks_ms()
+
+    def finish(self) -> None:
+        self.ready.set()
+
+        for line in self.get_report():
+            log(f"Boot {line}")
+
+    def get_report(self) -> list[str]:
+        lines = []
+        total = 0
+
+        for name, duration in self.stages:
+            total += duration
+            lines.append(f"{name:10} {duration:8} {total:8}")
+
+        return lines
+
+
+boot = _Boot()
@@ -0,0 +1,93 @@
+import board
+import sys
+import time
+from busio import I2C
+
+from app.boot import boot
+from app.shared import log
+
+I2C_SCL_PIN = board.GP11
+I2C_SDA_PIN = board.GP10
+
+
+class _Bus:
+    # transparent wrapper for the I2C bus, which counts transactions, bytes,
+    # errors and time (in microseconds) for each device address
+    STAT_COUNT = 0
+    STAT_BYTES = 1
+    STAT_ERRORS = 2
+    STAT_TIME = 3
+
+    def __init__(self, bus: I2C) -> None:
+        self._i2c = bus
+        self.stats = {}
+
+    def try_lock(self) -> bool:
+        return self._i2c.try_lock()
+
+    def unlock(self) -> None:
+        self._i2c.unlock()
+
+    def scan(self) -> list[int]:
+        return self._i2c.scan()
+
+    def readfrom_into(
+        self, address: int, buffer, *, start: int = 0, end: int = sys.maxsize
+    ) -> None:
+        size = min(end, len(buffer)) - start
+        self._call(address, size, self._i2c.readfrom_into, buffer, start=start, end=end)
+
+    def writeto(
+        self, address: int, buffer, *, start: int = 0, end: int = sys.maxsize
+    ) -> None:
+        size = min(end, len(buffer)) - start
+        self._call(address, size, self._i2c.writeto, buffer, start=start, end=end)
+
+    def writeto_then_readfrom(  # pylint:disable=too-many-arguments
+        self,
+        address: int,
+        out_buffer,
+        in_buffer,
+        *,
+        out_start: int = 0,
+        out_end: int = sys.maxsize,
+        in_start: int = 0,
+        in_end: int = sys.maxsize,
+    ) -> None:
+        size = min(out_end, len(out_buffer)) - out_start
+        size += min(in_end, len(in_buffer)) - in_start
+
+        self._call(
+            address,
+            size,
+            self._i2c.writeto_then_readfrom,
+            out_buffer,
+            in_buffer,
+            out_start=out_start,
+            out_end=out_end,
+            in_start=in_start,
+            in_end=in_end,
+        )
+
+    def _call(self, address: int, size: int, fn, *args, **kwargs) -> None:
+        stats = self.stats.get(address)
+        if stats is None:
+            stats = self.stats[address] = [0, 0, 0, 0]
+
+        start_ns = time.monotonic_ns()
+
+        try:
+            fn(address, *args, **kwargs)
+        except OSError:
+            stats[self.STAT_ERRORS] += 1
+            raise
+        finally:
+            stats[self.STAT_COUNT] += 1
+            stats[self.STAT_TIME] += (time.monotonic_ns() - start_ns) // 1000
+
+        stats[self.STAT_BYTES] += size
+
+
+i2c = _Bus(I2C(scl=I2C_SCL_PIN, sda=I2C_SDA_PIN))
+log("I2C initialized")
+boot.stage("i2c")
@@ -0,0 +1,80 @@
+import rtc as _rtc
+import supervisor
+import time
+
+from adafruit_ds3231 import DS3231
+from adafruit_ticks import ticks_diff
+
+from app import const
+from app.boot import boot
+from app.bus import i2c
+from app.shared import get_day_number, log
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.lost_power = False
+
+        # times are counted in seconds since the midnight of the day the device
+        # was started, so they remain small integers, unlike the Unix timestamps
+        self.base_day = None
+        self._base_time = 0
+        self._time = 0
+        self._ticks = 0
+
+        self.sync()
+
+    def sync(self) -> None:
+        # reading the RTC allocates a struct_time, so it is only done once in a while;
+        # the time is interpolated using the millisecond ticks in the meantime
+        now = rtc.datetime
+        day = get_day_number(now.tm_year, now.tm_mon, now.tm_mday)
+
+        if self.base_day is None:
+            self.base_day = day
+            self._base_time = time.mktime(
+                (now.tm_year, now.tm_mon, now.tm_mday, 0, 0, 0, 0, 0, -1)
+            )
+
+        day_time = now.tm_hour * const.HOUR + now.tm_min * const.MINUTE + now.tm_sec
+        self._time = (day - self.base_day) * const.DAY + day_time
+        self._ticks = supervisor.ticks_ms()
+        self.lost_power = rtc.lost_power
+
+    def get_elapsed(self) -> int:
+        elapsed = ticks_diff(supervisor.ticks_ms(), self._ticks) // 1000
+
+        if elapsed >= const.CLOCK_SYNC_INTERVAL:
+            self.sync()
+            elapsed = 0
+
+        return elapsed
+
+    def get_time(self) -> int:
+        elapsed = self.get_elapsed()
+        return self._time + elapsed
+
+    def get_day(self, timestamp: int) -> int:
+        # number of days since 2000-01-01, like get_day_number
+        return self.base_day + timestamp // const.DAY
+
+    def get_day_time(self) -> int:
+        # number of seconds since midnight
+        return self.get_time() % const.DAY
+
+    def get_localtime(self) -> time.struct_time:
+        return time.localtime(self._base_time + self.get_time())
+
+    def get_second_delay(self) -> float:
+        # time left until get_time() returns the next second
+        elapsed = ticks_diff(supervisor.ticks_ms(), self._ticks) % 1000
+        return (1000 - elapsed) / 1000
+
+
+rtc = DS3231(i2c)
+_rtc.set_time_source(rtc)
+log("RTC initialized")
+
+clock = _Clock()
+log("Clock initialized")
+boot.stage("clock")
@@ -0,0 +1,108 @@
+import asyncio
+import supervisor
+import sys
+
+from adafruit_ticks import ticks_diff
+
+from app.boot import boot
+from app.bus import i2c
+from app.eeprom import eeprom
+from app.logger import logger
+from app.profiler import profiler
+from app.shared import iter_log
+from app.watchdog import wdt
+
+
+class _Console:
+    POLL_INTERVAL = 0.1
+
+    # nothing can be received until the USB serial console is connected
+    IDLE_POLL_INTERVAL = 5.0
+
+    # characters past the limit are dropped, commands are much shorter
+    MAX_LINE_LENGTH = 32
+
+    def __init__(self) -> None:
+        self.line = ""
+
+    async def loop(self) -> None:
+        if supervisor.runtime.serial_connected:
+            await asyncio.sleep(self.POLL_INTERVAL)
+        else:
+            await asyncio.sleep(self.IDLE_POLL_INTERVAL)
+
+        while supervisor.runtime.serial_bytes_available:
+            char = sys.stdin.read(1)
+
+            if char not in "\r\n":
+                if len(self.line) < self.MAX_LINE_LENGTH:
+                    self.line += char
+                continue
+
+            command, self.line = self.line.strip(), ""
+            if command:
+                self.execute(command)
+
+    def execute(self, command: str) -> None:
+        if command == "log":
+            self.print_log()
+        elif command == "i2c":
+            self.print_i2c()
+        elif command == "wdt":
+            self.print_wdt()
+        elif command == "boot":
+            self.print_boot()
+        elif command in ("profile on", "profile off"):
+            profiler.set_enabled(command == "profile on")
+            print("OK")
+            return
+        elif command == "profile":
+            self.print_profile()
+        else:
+            print(f"Unknown command: {command}")
+            return
+
+        print("END")
+
+    def print_log(self) -> None:
+        # frames waiting in the queue would be missing otherwise
+        logger.flush()
+
+        for line in iter_log(eeprom, logger.FIRST_BYTE, logger.LAST_BYTE):
+            wdt.feed()
+            print(line)
+
+    def print_i2c(self) -> None:
+        for address in sorted(i2c.stats):
+            count, size, errors, time_us = i2c.stats[address]
+            print(f"{address:#04x} {count:10} {size:10} {errors:6} {time_us:12}")
+
+    def print_boot(self) -> None:
+        for line in boot.get_report():
+            print(line)
+
+    def print_wdt(self) -> None:
+        now = supervisor.ticks_ms()
+
+        for task, name in enumerate(wdt.TASK_NAMES):
+            heartbeat = wdt.heartbeats[task]
+            if heartbeat == wdt.NO_HEARTBEAT:
+                print(f"{name:10} {'-':>8}")
+            else:
+                print(f"{name:10} {ticks_diff(now, heartbeat):8}")
+
+        if wdt.worst_task is not None:
+            print(f"{'lag':10} {wdt.worst_lag:8} {wdt.TASK_NAMES[wdt.worst_task]}")
+
+    def print_profile(self) -> None:
+        for hook, name in enumerate(profiler.NAMES):
+            summary = profiler.get_summary(hook)
+            if summary is None:
+                continue
+
+            lo, mean, p99, hi = summary
+            count = profiler.totals[hook]
+            print(f"{name:10} {count:8} {lo:6} {mean:8.1f} {p99:6} {hi:6}")
+
+
+console = _Console()
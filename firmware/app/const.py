@@ -5,11 +5,27 @@ MINUTE = 60 * SECOND
 HOUR = 60 * MINUTE
 DAY = 24 * HOUR
 
+# log frame consists of message ID, hour, minute, second, 8-bit sequence number,
+# 16-bit day number (little endian) and checksum; the sequence number only
+# has to be unique within the ring, which is shorter than its range
+LOG_FRAME_SIZE = 8
+LOG_SEQ_MODULO = 1 << 8
+
+# the highest bits of the hour (3), minute (2) and second (2) are not used
+# by the time, so they store a duration related to the entry, e.g. the event
+# loop lag, in tenths of a second; they are zero for the other entries
+LOG_DURATION_UNIT = 100
+LOG_DURATION_MAX = 127
+
+# day number of entries logged before the date was stored
+LOG_DAY_UNKNOWN = 0xFFFF
+
 BOARD_INIT = 0
 RTC_SAVE = 8
 SETTINGS_ERROR = 16
 SETTINGS_SAVE = 17
 SETTINGS_RESET = 18
+SETTINGS_REPAIR = 19
 SCHEDULER_INIT = 24
 SCHEDULER_ERROR = 25
 ACT_OPEN_START = 32
@@ -20,6 +36,14 @@ ACT_CLOSE_START = 36
 ACT_CLOSE_START_AUTO = 37
 ACT_CLOSE_START_MEASURE = 38
 ACT_CLOSE_STOP = 39
+TASK_TIMEOUT = 40
+TASK_TIMEOUT_MENU = 41
+TASK_TIMEOUT_LOGGER = 42
+TASK_TIMEOUT_MOTOR = 43
+LOOP_LAG = 44
+LOOP_LAG_MENU = 45
+LOOP_LAG_LOGGER = 46
+LOOP_LAG_MOTOR = 47
 
 MENU_PREVIEW = 128
 MENU_OPEN = 129
@@ -32,59 +56,25 @@ MENU_RETURN = 135
 
 INVALID = 255
 
-TRANSLATIONS = {
-    "en": {
-        BOARD_INIT: "Device start",
-        RTC_SAVE: "Clock updated",
-        SETTINGS_ERROR: "Settings error",
-        SETTINGS_SAVE: "Settings updated",
-        SETTINGS_RESET: "Factory settings",
-        SCHEDULER_INIT: "Scheduler start",
-        SCHEDULER_ERROR: "Clock error",
-        ACT_OPEN_START: "Opening (1)",
-        ACT_OPEN_START_AUTO: "Opening (A)",
-        ACT_OPEN_START_MEASURE: "Opening (M)",
-        ACT_OPEN_STOP: "Opened",
-        ACT_CLOSE_START: "Closing (1)",
-        ACT_CLOSE_START_AUTO: "Closing (A)",
-        ACT_CLOSE_START_MEASURE: "Closing (M)",
-        ACT_CLOSE_STOP: "Closed",
-        INVALID: "(empty)",
-        MENU_PREVIEW: "Preview",
-        MENU_OPEN: "Open",
-        MENU_CLOSE: "Close",
-        MENU_SET_OPEN: "Set opening",
-        MENU_SET_CLOSE: "Set closing",
-        MENU_SET_TIME: "Set clock",
-        MENU_HISTORY: "History",
-        MENU_RETURN: "Return",
-    },
-    "pl": {
-        BOARD_INIT: "Start urzadzenia",
-        RTC_SAVE: "Zmiana czasu",
-        SETTINGS_ERROR: "Blad ustawien",
-        SETTINGS_SAVE: "Zmiana ustawien",
-        SETTINGS_RESET: "Ustaw.fabryczne",
-        SCHEDULER_INIT: "Start planisty",
-        SCHEDULER_ERROR: "Blad zegara",
-        ACT_OPEN_START: "Otwieranie (1)",
-        ACT_OPEN_START_AUTO: "Otwieranie (A)",
-        ACT_OPEN_START_MEASURE: "Otwieranie (M)",
-        ACT_OPEN_STOP: "Otworzono",
-        ACT_CLOSE_START: "Zamykanie (1)",
-        ACT_CLOSE_START_AUTO: "Zamykanie (A)",
-        ACT_CLOSE_START_MEASURE: "Zamykanie (M)",
-        ACT_CLOSE_STOP: "Zamknieto",
-        INVALID: "(pusty)",
-        MENU_PREVIEW: "Podglad",
-        MENU_OPEN: "Otworz",
-        MENU_CLOSE: "Zamknij",
-        MENU_SET_OPEN: "Ust.otwierania",
-        MENU_SET_CLOSE: "Ust.zamykania",
-        MENU_SET_TIME: "Ust.zegara",
-        MENU_HISTORY: "Historia",
-        MENU_RETURN: "Powrot",
-    },
-}
-
 LANG = os.getenv("LANG", "en")
+
+# texts of the selected language, compiled by translations.py; the blob starts
+# with the table of offsets, indexed by text ID
+try:
+    with open(f"{__file__.rsplit('/', 1)[0]}/lang/{LANG}.bin", "rb") as f:
+        TRANSLATIONS = memoryview(f.read())
+except OSError:
+    TRANSLATIONS = memoryview(b"")
+
+# number of seconds after which the cached time is read from the RTC again
+CLOCK_SYNC_INTERVAL = int(os.getenv("CLOCK_SYNC_INTERVAL", str(MINUTE)))
+
+# number of seconds between the verifications of settings stored in EEPROM,
+# the record of one action is verified at a time
+SCRUB_INTERVAL = int(os.getenv("SCRUB_INTERVAL", str(HOUR)))
+
+# number of seconds without any input after which the device goes to sleep
+IDLE_TIMEOUT = int(os.getenv("IDLE_TIMEOUT", str(30 * SECOND)))
+
+# maximum number of times per second the menu is drawn on the display
+FRAME_RATE = int(os.getenv("FRAME_RATE", "20"))
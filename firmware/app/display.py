@@ -0,0 +1,238 @@
+import board
+from digitalio import DigitalInOut
+from pwmio import PWMOut
+
+from adafruit_character_lcd.character_lcd import Character_LCD_Mono
+
+from app.boot import boot
+from app.profiler import profiler
+from app.shared import log
+
+LCD_RS_PIN = board.GP9
+LCD_EN_PIN = board.GP8
+LCD_DB4_PIN = board.GP7
+LCD_DB5_PIN = board.GP6
+LCD_DB6_PIN = board.GP5
+LCD_DB7_PIN = board.GP4
+LCD_BL_PIN = board.GP3
+
+
+class _Display:  # pylint:disable=too-many-instance-attributes
+    WIDTH = 16
+    HEIGHT = 2
+
+    BACKLIGHT_HIGH = 50
+    BACKLIGHT_LOW = 15
+    BACKLIGHT_OFF = 1
+
+    SLOT_COUNT = 8
+
+    # static parts of the screens are precomposed, and numbers are written
+    # directly to the buffer, so the frames can be drawn without allocations
+    BLANK = b" " * (WIDTH * HEIGHT)
+
+    # two digits of every number from 00 to 99
+    DIGITS = "".join(f"{n:02}" for n in range(100)).encode()
+
+    ZERO = 0x30
+    SPACE = 0x20
+    COLON = 0x3A
+    DASH = 0x2D
+
+    CHAR_OPEN = 0, 0b11000, 0b10110, 0b10001, 0b10110, 0b11000, 0, 0
+    CHAR_CLOSE = 0, 0b00011, 0b01101, 0b10001, 0b01101, 0b00011, 0, 0
+    CHAR_SET_OPEN = 0, 0b11000, 0b10110, 0b00001, 0b11010, 0b11000, 0, 0
+    CHAR_SET_CLOSE = 0, 0b00011, 0b01101, 0b10000, 0b01011, 0b00011, 0, 0
+    CHAR_SET_SYSTEM = 0, 0b00100, 0b00010, 0b10010, 0b01110, 0b00001, 0, 0
+    CHAR_TIME = 0, 0b01110, 0b10101, 0b10111, 0b10001, 0b01110, 0, 0
+    CHAR_OK = 0, 0b00001, 0b00010, 0b00100, 0b10100, 0b01000, 0, 0
+    CHAR_CANCEL = 0, 0b10001, 0b01010, 0b00100, 0b01010, 0b10001, 0, 0
+    CHAR_CURSOR_L = 0b00101, 0b00000, 0b00100, 0, 0, 0b00100, 0b00000, 0b00101
+    CHAR_CURSOR_R = 0b10100, 0b00000, 0b00100, 0, 0, 0b00100, 0b00000, 0b10100
+    CHAR_CURSOR_ALT_L = 0b00111, 0b00100, 0b00100, 0, 0, 0b00100, 0b00100, 0b00111
+    CHAR_CURSOR_ALT_R = 0b11100, 0b00100, 0b00100, 0, 0, 0b00100, 0b00100, 0b11100
+
+    CURSOR_CHARS = CHAR_CURSOR_L, CHAR_CURSOR_R
+    CURSOR_ALT_CHARS = CHAR_CURSOR_ALT_L, CHAR_CURSOR_ALT_R
+
+    def __init__(self) -> None:
+        self._display = Character_LCD_Mono(
+            rs=DigitalInOut(LCD_RS_PIN),
+            en=DigitalInOut(LCD_EN_PIN),
+            db4=DigitalInOut(LCD_DB4_PIN),
+            db5=DigitalInOut(LCD_DB5_PIN),
+            db6=DigitalInOut(LCD_DB6_PIN),
+            db7=DigitalInOut(LCD_DB7_PIN),
+            columns=self.WIDTH,
+            lines=self.HEIGHT,
+        )
+        # number of commands and data bytes sent to the LCD
+        self.lcd_commands = 0
+        self.lcd_bytes = 0
+
+        # LCD address counter, as the buffer index, or None if it does not point
+        # to a visible cell
+        self._cursor = None
+
+        # bitmap stored in each CGRAM slot, and the last frame it was used in;
+        # the frame counter is increased every time the buffer is cleared
+        self._slots = [None] * self.SLOT_COUNT
+        self._slot_frames = [0] * self.SLOT_COUNT
+        self._frame = 0
+
+        self._cur_buffer = bytearray(self.BLANK)
+        self._old_buffer = bytearray(self.BLANK)
+        self.clear()
+
+        self._backlight = PWMOut(LCD_BL_PIN)
+        self.set_backlight(self.BACKLIGHT_OFF)
+
+    def clear(self, template: bytes | None = None) -> None:
+        self._copy(self.BLANK if template is None else template, self._cur_buffer)
+        self._frame += 1
+
+    def write(self, pos: tuple[int, int], data: bytes | memoryview) -> None:
+        col, row = pos
+        byte_id = row * self.WIDTH + col
+
+        # byte by byte, as slicing would allocate
+        for idx in range(len(data)):  # pylint:disable=consider-using-enumerate
+            self._cur_buffer[byte_id + idx] = data[idx]
+
+    def write_number(
+        self, pos: tuple[int, int], value: int, width: int, pad: int = SPACE
+    ) -> None:
+        # right-aligned, the digits which do not fit are not shown
+        col, row = pos
+        first = row * self.WIDTH + col
+        last = first + width - 1
+
+        for byte_id in range(last, first - 1, -1):
+            if value or byte_id == last:
+                self._cur_buffer[byte_id] = self.ZERO + value % 10
+                value //= 10
+            else:
+                self._cur_buffer[byte_id] = pad
+
+    def write_time(
+        self, pos: tuple[int, int], hour: int, minute: int, second: int | None = None
+    ) -> None:
+        col, row = pos
+        byte_id = row * self.WIDTH + col
+
+        self._write_pair(byte_id, hour)
+        self._cur_buffer[byte_id + 2] = self.COLON
+        self._write_pair(byte_id + 3, minute)
+
+        if second is not None:
+            self._cur_buffer[byte_id + 5] = self.COLON
+            self._write_pair(byte_id + 6, second)
+
+    def write_date(
+        self, pos: tuple[int, int], month: int, day: int, year: int | None = None
+    ) -> None:
+        col, row = pos
+        byte_id = row * self.WIDTH + col
+
+        if year is not None:
+            self._write_pair(byte_id, year // 100)
+            self._write_pair(byte_id + 2, year % 100)
+            self._cur_buffer[byte_id + 4] = self.DASH
+            byte_id += 5
+
+        self._write_pair(byte_id, month)
+        self._cur_buffer[byte_id + 2] = self.DASH
+        self._write_pair(byte_id + 3, day)
+
+    def _copy(self, src: bytes | bytearray, dst: bytearray) -> None:
+        for byte_id in range(len(dst)):  # pylint:disable=consider-using-enumerate
+            dst[byte_id] = src[byte_id]
+
+    def _write_pair(self, byte_id: int, value: int) -> None:
+        digit_id = value % 100 * 2
+        self._cur_buffer[byte_id] = self.DIGITS[digit_id]
+        self._cur_buffer[byte_id + 1] = self.DIGITS[digit_id + 1]
+
+    def flush(self) -> None:
+        profiler.begin(profiler.DISPLAY)
+
+        cur, old = self._cur_buffer, self._old_buffer
+
+        for row in range(0, self.HEIGHT):
+            offset = row * self.WIDTH
+            col = 0
+
+            while col < self.WIDTH:
+                if cur[offset + col] == old[offset + col]:
+                    col += 1
+                    continue
+
+                # extend the run over single unchanged cells, as rewriting them
+                # is as cheap as moving the cursor
+                end = col + 1
+                while end < self.WIDTH and (
+                    cur[offset + end] != old[offset + end]
+                    or end + 1 < self.WIDTH
+                    and cur[offset + end + 1] != old[offset + end + 1]
+                ):
+                    end += 1
+
+                self._write_run(col, row, offset + col, offset + end)
+                col = end
+
+        self._copy(cur, old)
+
+        profiler.end(profiler.DISPLAY)
+        profiler.end(profiler.LATENCY)
+
+    def _write_run(self, col: int, row: int, first: int, last: int) -> None:
+        if self._cursor != first:
+            self._display.cursor_position(col, row)
+            self.lcd_commands += 1
+
+        for byte_id in range(first, last):
+            self._display._write8(  # pylint:disable=protected-access
+                self._cur_buffer[byte_id], True
+            )
+
+        self.lcd_bytes += last - first
+
+        # address counter does not wrap to the next row
+        self._cursor = last if last % self.WIDTH else None
+
+    def write_char(self, pos: tuple[int, int], bitmap: tuple[int, ...]) -> None:
+        col, row = pos
+        self._cur_buffer[row * self.WIDTH + col] = self.get_slot(bitmap)
+
+    def get_slot(self, bitmap: tuple[int, ...]) -> int:
+        if bitmap in self._slots:
+            slot = self._slots.index(bitmap)
+        else:
+            # replace the least recently used character
+            slot = min(range(self.SLOT_COUNT), key=lambda x: self._slot_frames[x])
+
+            # it would change the cells which are already written in this frame
+            if self._slot_frames[slot] == self._frame:
+                raise ValueError("Too many custom characters")
+
+            self.create_char(slot, bitmap)
+
+        self._slot_frames[slot] = self._frame
+        return slot
+
+    def create_char(self, slot: int, bitmap: tuple[int, ...]) -> None:
+        self._display.create_char(slot, bitmap)
+        self._slots[slot] = bitmap
+        self.lcd_commands += 1
+        self.lcd_bytes += len(bitmap)
+
+        # address counter points to CGRAM now
+        self._cursor = None
+
+    def set_backlight(self, value: int) -> None:
+        self._backlight.duty_cycle = value * 65535 // 100
+
+
+display = _Display()
+log("Display initialized")
+boot.stage("display")
@@ -0,0 +1,66 @@
+import supervisor
+import time
+
+from adafruit_24lc32 import EEPROM_I2C
+from adafruit_bus_device.i2c_device import I2CDevice
+from adafruit_ticks import ticks_add, ticks_diff
+
+from app.boot import boot
+from app.bus import i2c
+from app.shared import log
+
+EEPROM_ADDRESS = 0x57
+
+
+class _EEPROM:
+    PAGE_SIZE = 32
+
+    # maximum duration of the internal write cycle, in milliseconds, the chip
+    # does not respond to any commands until it is finished
+    WRITE_CYCLE = 5
+
+    def __init__(self) -> None:
+        self._eeprom = EEPROM_I2C(i2c, EEPROM_ADDRESS)
+        self._device = I2CDevice(i2c, EEPROM_ADDRESS)
+
+        # ticks are used, as the float monotonic() time loses its millisecond
+        # resolution after a few hours of uptime
+        self._ready_ticks = supervisor.ticks_ms()
+
+    def __getitem__(self, key: slice) -> bytearray:
+        self.wait()
+        return self._eeprom[key]
+
+    def __setitem__(self, key: slice, value: bytes | bytearray | list[int]) -> None:
+        self.wait()
+        self._eeprom[key] = value
+
+    def wait(self) -> None:
+        delay = ticks_diff(self._ready_ticks, supervisor.ticks_ms())
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def write_page(self, address: int, data: bytes | bytearray | memoryview) -> None:
+        # data must not cross the page boundary, as it would wrap around
+        # to the beginning of the same page
+        if address // self.PAGE_SIZE != (address + len(data) - 1) // self.PAGE_SIZE:
+            raise ValueError("Page boundary crossed")
+
+        self.wait()
+
+        buffer = bytearray(2 + len(data))
+        buffer[0] = address // 256
+        buffer[1] = address % 256
+        buffer[2:] = data
+
+        with self._device as device:
+            device.write(buffer)
+
+        # do not wait here, any other EEPROM access will be delayed if needed;
+        # one more millisecond, as the current one could be almost over
+        self._ready_ticks = ticks_add(supervisor.ticks_ms(), self.WRITE_CYCLE + 1)
+
+
+eeprom = _EEPROM()
+log("EEPROM initialized")
+boot.stage("eeprom")
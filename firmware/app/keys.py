@@ -0,0 +1,164 @@
+import board
+import keypad
+import supervisor
+
+from adafruit_ticks import ticks_add, ticks_diff
+
+from app import const
+from app.boot import boot
+from app.profiler import profiler
+from app.shared import log
+from app.watchdog import wdt
+
+KEY_LEFT_PIN = board.GP13
+KEY_RIGHT_PIN = board.GP14
+KEY_ENTER_PIN = board.GP15
+KEY_PINS = (KEY_LEFT_PIN, KEY_RIGHT_PIN, KEY_ENTER_PIN)
+
+
+class _Keys:
+    LEFT = 0
+    RIGHT = 1
+    ENTER = 2
+
+    HOLD_KEYS = [LEFT, RIGHT]
+    HOLD_THRESHOLD = 1000
+    HOLD_INTERVAL = 50
+
+    QUEUE_SIZE = 8
+    POLL_INTERVAL = 0.05
+    MIN_INTERVAL = 0.001
+
+    # keys are polled less often when they were not used for a while,
+    # so the first press can take a bit longer to be handled
+    IDLE_POLL_INTERVAL = 0.2
+    ACTIVE_TIME = 3000
+
+    # ticks can only be compared if they are less than half of the period apart
+    MAX_IDLE_TIME = const.DAY * 1000
+
+    def __init__(self) -> None:
+        self._keys = None
+        self._event = keypad.Event()
+
+        self._key_number = None
+        self._key_timestamp = 0
+        self._repeat_timestamp = 0
+        self._input_timestamp = supervisor.ticks_ms()
+
+        self.start()
+
+    def start(self) -> None:
+        self._keys = keypad.Keys(
+            pins=KEY_PINS, value_when_pressed=False, max_events=self.QUEUE_SIZE
+        )
+
+    def stop(self) -> None:
+        # pins have to be released before they can be used to wake up the device
+        self._keys.deinit()
+        self._key_number = None
+
+    def touch(self) -> None:
+        self._input_timestamp = supervisor.ticks_ms()
+
+    def get_idle_time(self) -> float:
+        if self._key_number is not None:
+            return 0.0
+
+        now = supervisor.ticks_ms()
+        idle_time = min(ticks_diff(now, self._input_timestamp), self.MAX_IDLE_TIME)
+
+        # keep the timestamp from getting too old, so the difference never wraps around
+        self._input_timestamp = ticks_add(now, -idle_time)
+        return idle_time / 1000
+
+    async def get(self, timeout: float | None = None) -> tuple[int | None, float]:
+        # keypad has no way to notify about new events, so its queue is polled here,
+        # but the caller is only woken up on input, hold-repeat or timeout
+        start = supervisor.ticks_ms()
+
+        while True:
+            key, duration = self._read()
+            if key is not None:
+                return key, duration
+
+            now = supervisor.ticks_ms()
+            delay = self.POLL_INTERVAL
+
+            if (
+                self._key_number is None
+                and ticks_diff(now, self._input_timestamp) >= self.ACTIVE_TIME
+            ):
+                delay = self.IDLE_POLL_INTERVAL
+
+            if timeout is not None:
+                remaining = timeout - ticks_diff(now, start) / 1000
+                if remaining <= 0:
+                    return None, 0.0
+                delay = min(delay, remaining)
+
+            if self._key_number in self.HOLD_KEYS:
+                repeat = ticks_diff(self._repeat_timestamp, now) / 1000
+                delay = min(delay, repeat)
+
+            # time is measured in milliseconds, shorter waits would spin in place
+            await wdt.sleep(wdt.MENU, max(delay, self.MIN_INTERVAL))
+
+    async def wait_release(self, timeout: float) -> bool:
+        # check if the last pressed key is released before the timeout,
+        # other keys pressed in the meantime are ignored
+        start = supervisor.ticks_ms()
+
+        while self._key_number is not None:
+            while self._keys.events.get_into(self._event):
+                self._input_timestamp = self._event.timestamp
+
+                if (
+                    not self._event.pressed
+                    and self._event.key_number == self._key_number
+                ):
+                    self._key_number = None
+                    return True
+
+            if ticks_diff(supervisor.ticks_ms(), start) >= timeout * 1000:
+                return False
+
+            await wdt.sleep(wdt.MENU, self.POLL_INTERVAL)
+
+        return True
+
+    def _read(self) -> tuple[int | None, float]:
+        # handle one press at a time, so quick presses are not lost
+        while self._keys.events.get_into(self._event):
+            self._input_timestamp = self._event.timestamp
+
+            if self._event.pressed:
+                self._key_number = self._event.key_number
+                self._key_timestamp = self._event.timestamp
+                self._repeat_timestamp = ticks_add(
+                    self._key_timestamp, self.HOLD_THRESHOLD
+                )
+
+                profiler.begin(profiler.LATENCY, self._key_timestamp)
+                return self._key_number, 0.0
+
+            if self._event.key_number == self._key_number:
+                self._key_number = None
+
+        if self._key_number not in self.HOLD_KEYS:
+            return None, 0.0
+
+        # supported key is held, duration is measured from the press event
+        now = supervisor.ticks_ms()
+        if ticks_diff(now, self._repeat_timestamp) < 0:
+            return None, 0.0
+
+        self._repeat_timestamp = ticks_add(now, self.HOLD_INTERVAL)
+
+        profiler.begin(profiler.LATENCY, now)
+        return self._key_number, ticks_diff(now, self._key_timestamp) / 1000
+
+
+keys = _Keys()
+log("Keys initialized")
+boot.stage("keys")
@@ -0,0 +1,268 @@
+import asyncio
+
+from app import const
+from app.clock import clock
+from app.eeprom import eeprom
+from app.profiler import profiler
+from app.shared import _, find_head, get_checksum, log, verify_checksum
+from app.types import HistoryT
+from app.watchdog import wdt
+
+
+class _Logger:
+    FIRST_BYTE = 1024
+    LAST_BYTE = 2048
+
+    FRAME_SIZE = const.LOG_FRAME_SIZE
+    FRAME_COUNT = (LAST_BYTE - FIRST_BYTE) // FRAME_SIZE
+
+    SEQ_MODULO = const.LOG_SEQ_MODULO
+    DAY_UNKNOWN = const.LOG_DAY_UNKNOWN
+
+    # decoded entry consists of message ID, hour, minute, second and day number
+    ENTRY_SIZE = 6
+    INVALID_ENTRY = bytes((255, 0, 0, 0, 255, 255))
+
+    # frames waiting to be written to EEPROM, if the queue is full,
+    # it is written synchronously, so no entries are lost
+    QUEUE_SIZE = 16
+
+    # short delay, so the events logged at the same time are written together
+    QUEUE_DELAY = 0.05
+
+    # version 1 frames were followed by the end frame instead of sequence numbers
+    V1_END_FRAME = [255, 0, 0, 0, 0, 0, 0]
+    V1_END_FRAME.append(get_checksum(V1_END_FRAME))
+
+    def __init__(self) -> None:
+        # location of the next write, found on first use, as the log is scanned
+        # after the first frame is shown
+        self.address = None
+        self.seq = 0
+
+        self.queue = bytearray(self.QUEUE_SIZE * self.FRAME_SIZE)
+        self.queue_address = self.FIRST_BYTE
+        self.queue_length = 0
+        self.queue_event = asyncio.Event()
+
+        # RAM mirror of the decoded log entries, in the same order as EEPROM frames;
+        # loaded on first use, as it is not needed to find the location for writes
+        self.entries = None
+
+    def find_head(self) -> None:
+        frame_id = find_head(self.FRAME_COUNT, self.get_seq, self.SEQ_MODULO)
+        last_seq = self.get_seq((frame_id - 1) % self.FRAME_COUNT)
+
+        self.address = self.FIRST_BYTE + frame_id * self.FRAME_SIZE
+        self.seq = 0 if last_seq is None else (last_seq + 1) % self.SEQ_MODULO
+
+    def get_seq(self, frame_id: int) -> int | None:
+        first = self.FIRST_BYTE + frame_id * self.FRAME_SIZE
+        raw = eeprom[first : first + self.FRAME_SIZE]
+
+        if not verify_checksum(raw):
+            return None
+
+        return raw[4]
+
+    def load_entries(self) -> None:
+        self.flush()
+        self.entries = bytearray(self.FRAME_COUNT * self.ENTRY_SIZE)
+
+        # copy EEPROM to RAM
+        raw = eeprom[self.FIRST_BYTE : self.LAST_BYTE]
+
+        for address in range(self.FIRST_BYTE, self.LAST_BYTE, self.FRAME_SIZE):
+            first = address - self.FIRST_BYTE
+            last = first + self.FRAME_SIZE
+            self.set_entry(address, raw[first:last])
+
+    def set_entry(self, address: int, frame: list[int] | bytearray) -> None:
+        first = (address - self.FIRST_BYTE) // self.FRAME_SIZE * self.ENTRY_SIZE
+        last = first + self.ENTRY_SIZE
+
+        if verify_checksum(frame):
+            # duration stored in the highest bits of the time is skipped
+            self.entries[first] = frame[0]
+            self.entries[first + 1] = frame[1] & 0x1F
+            self.entries[first + 2] = frame[2] & 0x3F
+            self.entries[first + 3] = frame[3] & 0x3F
+            self.entries[first + 4 : last] = bytes(frame[5:7])
+        else:
+            self.entries[first:last] = self.INVALID_ENTRY
+
+    def get(self, log_id: int) -> HistoryT:
+        if self.entries is None:
+            self.load_entries()
+
+        # self.address is the location for the next write
+        # so the #0 is self.address-8
+        #        #1 is self.address-16, and so on
+        frame_id = (self.address - self.FIRST_BYTE) // self.FRAME_SIZE - log_id - 1
+
+        # handle wraparound
+        first = frame_id % self.FRAME_COUNT * self.ENTRY_SIZE
+
+        entry = self.entries[first : first + self.ENTRY_SIZE]
+        return HistoryT(
+            entry[0], entry[1], entry[2], entry[3], entry[4] + entry[5] * 256
+        )
+
+    def log(self, message_id: int, duration: int = 0) -> None:
+        # duration in milliseconds is rounded down, and limited to the stored range
+        profiler.begin(profiler.LOGGER)
+        log(bytes(_(message_id)).decode())
+
+        if self.address is None:
+            self.find_head()
+
+        now = clock.get_time()
+        day = clock.get_day(now)
+        day_time = now % const.DAY
+        units = min(duration // const.LOG_DURATION_UNIT, const.LOG_DURATION_MAX)
+
+        hour = day_time // const.HOUR | units >> 4 << 5
+        minute = day_time // const.MINUTE % 60 | (units >> 2 & 3) << 6
+        second = day_time % const.MINUTE | (units & 3) << 6
+
+        raw = [message_id, hour, minute, second, self.seq]
+        raw += [day % 256, day // 256]
+        raw.append(get_checksum(raw))
+
+        if self.queue_length == self.QUEUE_SIZE:
+            self.flush()
+
+        if not self.queue_length:
+            self.queue_address = self.address
+            wdt.start(wdt.LOGGER)
+
+        # queue log data
+        # the next frame does not have to be touched, as it breaks the sequence
+        first = self.queue_length * self.FRAME_SIZE
+        last = first + self.FRAME_SIZE
+        self.queue[first:last] = bytearray(raw)
+        self.queue_length += 1
+        self.queue_event.set()
+
+        if self.entries is not None:
+            self.set_entry(self.address, raw)
+
+        self.address += self.FRAME_SIZE
+        self.seq = (self.seq + 1) % self.SEQ_MODULO
+
+        # handle wraparound
+        if self.address >= self.LAST_BYTE:
+            self.address = self.FIRST_BYTE
+
+        profiler.end(profiler.LOGGER)
+
+    def write_queue(self) -> None:
+        # write as many frames as possible without crossing the page boundary,
+        # log area is aligned to the page size so the end of the log is also handled
+        address = self.queue_address
+        page_end = (address // eeprom.PAGE_SIZE + 1) * eeprom.PAGE_SIZE
+
+        length = min(self.queue_length, (page_end - address) // self.FRAME_SIZE)
+        size = length * self.FRAME_SIZE
+
+        eeprom.write_page(address, memoryview(self.queue)[:size])
+
+        # move the remaining frames to the beginning of the queue
+        remaining = (self.queue_length - length) * self.FRAME_SIZE
+        self.queue[:remaining] = self.queue[size : size + remaining]
+        self.queue_length -= length
+        self.queue_address += size
+
+        if self.queue_address >= self.LAST_BYTE:
+            self.queue_address = self.FIRST_BYTE
+
+    def flush(self) -> None:
+        while self.queue_length:
+            self.write_queue()
+
+        wdt.stop(wdt.LOGGER)
+
+    async def loop(self) -> None:
+        await self.queue_event.wait()
+        self.queue_event.clear()
+
+        await wdt.sleep(wdt.LOGGER, self.QUEUE_DELAY)
+
+        while self.queue_length:
+            self.write_queue()
+            await wdt.sleep(wdt.LOGGER, eeprom.WRITE_CYCLE / 1000)
+
+        # nothing to do until the next entry is logged
+        wdt.stop(wdt.LOGGER)
+
+    def migrate(self, version: int) -> None:
+        self.flush()
+
+        if version < 2:
+            self.migrate_v1()
+        elif version < 4:
+            self.migrate_v2()
+
+        self.entries = None
+        self.find_head()
+
+    def migrate_v1(self) -> None:
+        log("Migrating log from version 1")
+
+        raw = eeprom[self.FIRST_BYTE : self.LAST_BYTE]
+        end_frame = bytearray(self.V1_END_FRAME)
+
+        # without the end frame, the next write would go to the first frame
+        head = self.FRAME_COUNT
+        for frame_id in range(self.FRAME_COUNT):
+            first = frame_id * self.FRAME_SIZE
+            if raw[first : first + self.FRAME_SIZE] == end_frame:
+                head = frame_id
+                break
+
+        # frames are updated in place: the ones before the end frame are the newest,
+        # the ones after the end frame are from the previous pass over the ring
+        for frame_id in range(self.FRAME_COUNT):
+            wdt.feed()
+
+            first = frame_id * self.FRAME_SIZE
+            frame = raw[first : first + self.FRAME_SIZE]
+            address = self.FIRST_BYTE + first
+
+            if frame_id == head:
+                eeprom[address : address + self.FRAME_SIZE] = bytearray(self.FRAME_SIZE)
+                continue
+
+            if not verify_checksum(frame):
+                continue
+
+            seq = frame_id if frame_id < head else frame_id - self.FRAME_COUNT
+            seq %= self.SEQ_MODULO
+
+            self.migrate_frame(address, frame, seq)
+
+    def migrate_v2(self) -> None:
+        log("Migrating log from version 2")
+
+        raw = eeprom[self.FIRST_BYTE : self.LAST_BYTE]
+
+        # 24-bit sequence numbers are truncated, which keeps them consecutive
+        for frame_id in range(self.FRAME_COUNT):
+            wdt.feed()
+
+            first = frame_id * self.FRAME_SIZE
+            frame = raw[first : first + self.FRAME_SIZE]
+            address = self.FIRST_BYTE + first
+
+            if verify_checksum(frame):
+                self.migrate_frame(address, frame, frame[4])
+
+    def migrate_frame(self, address: int, frame: bytearray, seq: int) -> None:
+        day = self.DAY_UNKNOWN
+
+        frame[4:] = bytearray((seq, day % 256, day // 256, 0))
+        frame[7] = get_checksum(frame[:7])
+        eeprom[address + 4 : address + self.FRAME_SIZE] = frame[4:]
+
+
+logger = _Logger()
@@ -2,8 +2,23 @@ import asyncio
 import time
 
 from app import const
-from app.core import display, keys, logger, motor, rtc, scheduler, settings, wdt
-from app.shared import _, chunk, clamp, format_time, log
+from app.core import (
+    boot,
+    clock,
+    display,
+    i2c,
+    keys,
+    logger,
+    motor,
+    power,
+    profiler,
+    rtc,
+    run_forever,
+    scheduler,
+    settings,
+    wdt,
+)
+from app.shared import _, bisect, chunk, clamp, get_date, get_days_in_month, log
 from app.types import SettingsT
 
 
@@ -12,11 +27,35 @@ class MenuExit(Exception):
         self.code = code
 
 
+class _Renderer:
+    def __init__(self) -> None:
+        self.menu = None
+        self.event = asyncio.Event()
+
+    def invalidate(self, menu: "Menu") -> None:
+        if menu is self.menu:
+            self.event.set()
+
+    def flush(self) -> None:
+        # draw pending changes immediately, e.g. before a blocking operation
+        if self.event.is_set():
+            self.event.clear()
+            self.menu.render()
+
+    async def loop(self) -> None:
+        await self.event.wait()
+        self.flush()
+
+        # changes made in the meantime are drawn together in the next frame
+        await asyncio.sleep(1 / const.FRAME_RATE)
+
+
 class Menu:
     CURSORS = ()
     MIN_MAX_VALUES = ()
 
-    ALT_ICONS = False
+    # menus showing the time have to be redrawn when the next second begins
+    SHOWS_TIME = False
 
     def __init__(self) -> None:
         self.data = []
@@ -26,12 +65,31 @@ class Menu:
     def get_cursor(self) -> tuple[tuple[int, int], tuple[int, int]]:
         return self.CURSORS[self.pos]
 
+    def get_cursor_chars(self) -> tuple[tuple[int, ...], tuple[int, ...]]:
+        if self.edit:
+            return display.CURSOR_ALT_CHARS
+
+        return display.CURSOR_CHARS
+
+    def render_cursor(self) -> None:
+        pos_a, pos_b = self.get_cursor()
+        char_a, char_b = self.get_cursor_chars()
+
+        display.write_char(pos_a, char_a)
+        display.write_char(pos_b, char_b)
+
     def get_min_max_cursors(self) -> tuple[int, int]:
         return 0, len(self.CURSORS) - 1
 
     def get_min_max_values(self) -> tuple[int, int]:
         return self.MIN_MAX_VALUES[self.pos]
 
+    def get_refresh_interval(self) -> float | None:
+        return clock.get_second_delay() if self.SHOWS_TIME else None
+
+    def invalidate(self) -> None:
+        renderer.invalidate(self)
+
     def render(self) -> None:
         display.clear()
         display.write((0, 0), b"???")
@@ -39,11 +97,8 @@ class Menu:
 
     def enter(self) -> None:
         log(f"Switching to {self.__class__.__name__}")
-
-        if self.ALT_ICONS:
-            display.set_alternate_icons()
-
-        self.render()
+        renderer.menu = self
+        self.invalidate()
 
     async def loop(self) -> None:
         if self.edit:
@@ -52,9 +107,10 @@ class Menu:
             await self.loop_navi()
 
     async def loop_navi(self) -> None:
-        await asyncio.sleep(0.05)
+        key, duration = await keys.get(self.get_refresh_interval())
+        if key is not None:
+            profiler.begin(profiler.MENU)
 
-        key, duration = keys.get()
         if key == keys.LEFT:
             await self.loop_navi_left(duration)
         elif key == keys.RIGHT:
@@ -62,8 +118,10 @@ class Menu:
         elif key == keys.ENTER:
             await self.loop_navi_enter(duration)
 
-        if key is not None:
-            self.render()
+        if key is not None or self.SHOWS_TIME:
+            self.invalidate()
+
+        profiler.end(profiler.MENU)
 
     async def loop_navi_left(self, duration: float) -> None:
         _ = duration
@@ -80,9 +138,10 @@ class Menu:
         self._enter_edit_mode()
 
     async def loop_edit(self) -> None:
-        await asyncio.sleep(0.05)
+        key, duration = await keys.get(self.get_refresh_interval())
+        if key is not None:
+            profiler.begin(profiler.MENU)
 
-        key, duration = keys.get()
         if key == keys.LEFT:
             self.loop_edit_left(duration)
         elif key == keys.RIGHT:
@@ -90,8 +149,10 @@ class Menu:
         elif key == keys.ENTER:
             self.loop_edit_enter(duration)
 
-        if key is not None:
-            self.render()
+        if key is not None or self.SHOWS_TIME:
+            self.invalidate()
+
+        profiler.end(profiler.MENU)
 
     def loop_edit_left(self, duration: float) -> None:
         lo, hi = self.get_min_max_values()
@@ -106,10 +167,15 @@ class Menu:
         self._leave_edit_mode()
 
     def exit(self) -> None:
-        if self.ALT_ICONS:
-            display.set_default_icons()
+        return
 
     async def _enter_submenu(self, instance: "Menu") -> int:
+        # time spent in the submenu is not a part of the key handling
+        profiler.cancel(profiler.MENU)
+
+        # submenus need the settings and the log, which are loaded after boot
+        await boot.ready.wait()
+
         try:
             instance.enter()
             while True:
@@ -117,34 +183,61 @@ class Menu:
         except MenuExit as e:
             instance.exit()
             self.enter()
+
+            profiler.cancel(profiler.MENU)
             return e.code
 
     def _enter_edit_mode(self) -> None:
         display.set_backlight(display.BACKLIGHT_HIGH)
-        display.set_alternate_cursor()
         self.edit = True
 
     def _leave_edit_mode(self) -> None:
         self.edit = False
         display.set_backlight(display.BACKLIGHT_LOW)
-        display.set_default_cursor()
+        self.invalidate()
 
 
 class IdleMenu(Menu):
+    SHOWS_TIME = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.sleeping = False
+
     def render(self) -> None:
-        now = time.localtime()
+        day_time = clock.get_day_time()
+        hour, minute = day_time // const.HOUR, day_time // const.MINUTE % 60
+        second = None if self.sleeping else day_time % 60
 
         display.clear()
-        display.write((0, 0), format_time(now.tm_hour, now.tm_min, now.tm_sec))
-        display.write((11, 0), b"\x04!" if not wdt.enabled else b"")
-        display.write((14, 0), b"\x05!" if rtc.lost_power else b"")
+        display.write_time((0, 0), hour, minute, second)
+
+        if not wdt.enabled:
+            display.write_char((11, 0), display.CHAR_SET_SYSTEM)
+            display.write((12, 0), b"!")
+        if clock.lost_power:
+            display.write_char((14, 0), display.CHAR_TIME)
+            display.write((15, 0), b"!")
+
         display.flush()
 
     async def loop_navi(self) -> None:
+        self.sleeping = power.can_sleep()
+
+        if self.sleeping:
+            # seconds are not shown, as the display is not refreshed while sleeping
+            self.invalidate()
+            renderer.flush()
+
+            if power.sleep():
+                # let other tasks run after waking up
+                await asyncio.sleep(0)
+                return
+
         await super().loop_navi()
 
-        # time should be refreshed even if there is no input
-        self.render()
+        if scheduler.job:
+            await self._enter_submenu(JobMenu())
 
     async def loop_navi_left(self, duration: float) -> None:
         if duration > 3.0:
@@ -157,6 +250,53 @@ class IdleMenu(Menu):
         return
 
 
+class JobMenu(Menu):
+    SHOWS_TIME = True
+
+    TEMPLATE = b"                " b"    s ...       "
+
+    def get_duration(self) -> int:
+        return clock.get_time() - scheduler.job_time
+
+    def enter(self) -> None:
+        super().enter()
+        display.set_backlight(display.BACKLIGHT_LOW)
+
+    def render(self) -> None:
+        job = scheduler.job
+
+        display.clear(self.TEMPLATE)
+
+        if job == motor.ACT_OPEN:
+            display.write((13, 0), b"( )")
+            display.write_char((14, 0), display.CHAR_OPEN)
+        elif job == motor.ACT_CLOSE:
+            display.write((13, 0), b"( )")
+            display.write_char((14, 0), display.CHAR_CLOSE)
+
+        display.write_number((0, 1), self.get_duration(), 4)
+        display.flush()
+
+    async def loop_navi(self) -> None:
+        await super().loop_navi()
+
+        if not scheduler.job:
+            raise MenuExit()
+
+    async def loop_navi_left(self, duration: float) -> None:
+        return
+
+    async def loop_navi_right(self, duration: float) -> None:
+        return
+
+    async def loop_navi_enter(self, duration: float) -> None:
+        return
+
+    def exit(self) -> None:
+        super().exit()
+        display.set_backlight(display.BACKLIGHT_OFF)
+
+
 class MainMenu(Menu):
     CURSORS = (
         ((0, 0), (2, 0)),
@@ -180,6 +320,15 @@ class MainMenu(Menu):
         _(const.MENU_RETURN),
     )
 
+    ICONS = (
+        display.CHAR_TIME,
+        display.CHAR_OPEN,
+        display.CHAR_CLOSE,
+        display.CHAR_SET_OPEN,
+        display.CHAR_SET_CLOSE,
+        display.CHAR_SET_SYSTEM,
+    )
+
     ID_PREVIEW = 0
     ID_OPEN = 1
     ID_CLOSE = 2
@@ -189,24 +338,47 @@ class MainMenu(Menu):
     ID_HISTORY = 6
     ID_RETURN = 7
 
-    def get_label(self) -> bytes:
-        return self.LABELS[self.pos].encode()
+    DIAGNOSTICS_HOLD = 5.0
+
+    # menu is scrolled to the left when the last icons are selected
+    SCROLL_POS = 4
+
+    TEMPLATES = (
+        b"             \xD0 \x7F" b"                ",
+        b"            \xD0 \x7F " b"                ",
+    )
+    ICON_POSITIONS = (
+        tuple((1 + idx * 2, 0) for idx in range(len(ICONS))),
+        tuple((idx * 2, 0) for idx in range(len(ICONS))),
+    )
+    SCROLLED_CURSORS = tuple(
+        ((ax - 1, ay), (bx - 1, by)) for (ax, ay), (bx, by) in CURSORS
+    )
+
+    def get_label(self) -> memoryview:
+        return self.LABELS[self.pos]
 
     def enter(self) -> None:
         super().enter()
         display.set_backlight(display.BACKLIGHT_LOW)
 
+    def get_cursor(self) -> tuple[tuple[int, int], tuple[int, int]]:
+        if self.pos < self.SCROLL_POS:
+            return self.CURSORS[self.pos]
+
+        return self.SCROLLED_CURSORS[self.pos]
+
     def render(self) -> None:
-        (cax, cay), (cbx, cby) = self.get_cursor()
         label = self.get_label()
+        scrolled = int(self.pos >= self.SCROLL_POS)
 
-        # scroll menu to the left
-        offset = 0 if self.pos < 4 else -1
+        display.clear(self.TEMPLATES[scrolled])
 
-        display.clear()
-        display.write((1 + offset, 0), b"\x05 \x00 \x01 \x02 \x03 \x04 \xD0 \x7F")
-        display.write((cax + offset, cay), b"\x06")
-        display.write((cbx + offset, cby), b"\x07")
+        positions = self.ICON_POSITIONS[scrolled]
+        for idx in range(len(self.ICONS)):  # pylint:disable=consider-using-enumerate
+            display.write_char(positions[idx], self.ICONS[idx])
+
+        self.render_cursor()
         display.write((1, 1), label)
         display.flush()
 
@@ -226,58 +398,90 @@ class MainMenu(Menu):
         else:
             await super().loop_navi_enter(duration)
 
+    async def loop_navi_right(self, duration: float) -> None:
+        # hidden diagnostics screen, opened by holding the button on the last option
+        if self.pos == self.ID_RETURN and duration > self.DIAGNOSTICS_HOLD:
+            await self._enter_submenu(DiagnosticsMenu())
+        else:
+            await super().loop_navi_right(duration)
+
     async def loop_edit(self) -> None:
         reason = motor.REASON_ONESHOT
 
         if self.pos == self.ID_OPEN:
-            motor.open(reason, settings.load(motor.ACT_OPEN).duration_single)
-            self._leave_edit_mode()
+            await self._run(motor.aopen(reason, self._get_duration(motor.ACT_OPEN)))
         elif self.pos == self.ID_CLOSE:
-            motor.close(reason, settings.load(motor.ACT_CLOSE).duration_single)
-            self._leave_edit_mode()
+            await self._run(motor.aclose(reason, self._get_duration(motor.ACT_CLOSE)))
         else:
             await super().loop_navi()
 
+    @staticmethod
+    def _get_duration(action_id: int) -> float:
+        return settings.load(action_id).duration_single
+
+    async def _run(self, coro) -> None:
+        # keys are not read until the motor stops, show the highlighted option
+        # first; the job is monitored on its own like the scheduled ones
+        renderer.flush()
+        wdt.stop(wdt.MENU)
+
+        try:
+            await coro
+        finally:
+            wdt.start(wdt.MENU)
+
+        self._leave_edit_mode()
+
     def exit(self) -> None:
         super().exit()
         display.set_backlight(display.BACKLIGHT_OFF)
 
 
 class PreviewMenu(Menu):
+    TEMPLATE = b"     --:--:--   " b"                "
+
     def __init__(self) -> None:
         super().__init__()
 
-        tasks = sorted(scheduler.tasks, key=lambda t: t.timestamp)
+        # scheduler table is already sorted by timestamp; the time of day
+        # is calculated here, so it is not done again on every render
+        tasks = []
+        for action_id, timestamp in scheduler.get_tasks():
+            day_time = timestamp % const.DAY
+            hour = day_time // const.HOUR
+            minute = day_time // const.MINUTE % 60
+            tasks.append((action_id, hour, minute, day_time % 60))
+
         self.data = chunk(tasks, 2)
 
     def get_min_max_cursors(self) -> tuple[int, int]:
         return 0, len(self.data) - 1
 
     def render(self) -> None:
-        display.clear()
-        display.write((5, 0), b"--:--:--")
+        display.clear(self.TEMPLATE)
 
-        lo, hi = self.get_min_max_cursors()
-        display.write((0, 1), b"\x7F" if self.pos > lo else b" ")
-        display.write((1, 1), f"{self.pos + 1:02}".encode())
-        display.write((3, 1), b"\x7E" if self.pos < hi else b" ")
+        display.write((0, 1), b"\x7F" if self.pos > 0 else b" ")
+        display.write_number((1, 1), self.pos + 1, 2, display.ZERO)
+        display.write((3, 1), b"\x7E" if self.pos < len(self.data) - 1 else b" ")
 
         for row in (0, 1):
             try:
-                task = self.data[self.pos][row]
+                action_id, hour, minute, second = self.data[self.pos][row]
             except IndexError:
                 break
 
-            if task.action_id == motor.ACT_OPEN:
-                icon = b"(\x00)"
-            elif task.action_id == motor.ACT_CLOSE:
-                icon = b"(\x01)"
+            if action_id == motor.ACT_OPEN:
+                icon = display.CHAR_OPEN
+            elif action_id == motor.ACT_CLOSE:
+                icon = display.CHAR_CLOSE
             else:
-                icon = b""
+                icon = None
 
-            t = time.localtime(task.timestamp)
-            display.write((5, row), format_time(t.tm_hour, t.tm_min, t.tm_sec))
-            display.write((13, row), icon)
+            display.write_time((5, row), hour, minute, second)
+
+            if icon:
+                display.write((13, row), b"( )")
+                display.write_char((14, row), icon)
 
         display.flush()
 
@@ -306,13 +510,13 @@ class MotorMenu(Menu):
         (1, 20),
     )
 
-    ALT_ICONS = True
-
     ID_DURATION = 4
     ID_MEASURE = 6
     ID_OK = 7
     ID_CANCEL = 8
 
+    TEMPLATE = b"       -        " b"    s /         "
+
     def __init__(self, action_id: int) -> None:
         super().__init__()
 
@@ -321,17 +525,17 @@ class MotorMenu(Menu):
         self.action_id = action_id
 
     def render(self) -> None:
-        ca, cb = self.get_cursor()
-
-        display.clear()
-        display.write((1, 0), format_time(self.data[0], self.data[1]))
-        display.write((7, 0), b"-")
-        display.write((9, 0), format_time(self.data[2], self.data[3]))
-        display.write((1, 1), f"{self.data[4]:3}s".encode())
-        display.write((6, 1), f"/{self.data[5]}".encode())
-        display.write((10, 1), b"\x05 \x02 \x03")
-        display.write(ca, b"\x06")
-        display.write(cb, b"\x07")
+        divided_by = self.data[5]
+
+        display.clear(self.TEMPLATE)
+        display.write_time((1, 0), self.data[0], self.data[1])
+        display.write_time((9, 0), self.data[2], self.data[3])
+        display.write_number((1, 1), self.data[4], 3)
+        display.write_number((7, 1), divided_by, 1 if divided_by < 10 else 2)
+        display.write_char((10, 1), display.CHAR_TIME)
+        display.write_char((12, 1), display.CHAR_OK)
+        display.write_char((14, 1), display.CHAR_CANCEL)
+        self.render_cursor()
         display.flush()
 
     async def loop_navi_enter(self, duration: float) -> None:
@@ -349,11 +553,14 @@ class MotorMenu(Menu):
     def save(self) -> None:
         if tuple(self.initial) != tuple(self.data):
             settings.save(self.action_id, SettingsT(*self.data))
-            scheduler.restart()
+            scheduler.restart(self.action_id)
 
 
 class MeasurementMenu(Menu):
     MAX_VALUE = 999
+    SHOWS_TIME = True
+
+    TEMPLATE = JobMenu.TEMPLATE
 
     def __init__(self, action_id: int) -> None:
         super().__init__()
@@ -367,23 +574,17 @@ class MeasurementMenu(Menu):
         else:
             raise ValueError("Unknown action ID")
 
-        self.time = time.time()
+        self.time = clock.get_time()
         self.task = asyncio.create_task(coro)
 
     def get_duration(self) -> int:
-        return int(time.time() - self.time)
+        return clock.get_time() - self.time
 
     def render(self) -> None:
-        display.clear()
-        display.write((0, 1), f"{self.get_duration():4}s ...".encode())
+        display.clear(self.TEMPLATE)
+        display.write_number((0, 1), self.get_duration(), 4)
         display.flush()
 
-    async def loop_navi(self) -> None:
-        await super().loop_navi()
-
-        # time should be refreshed even if there is no input
-        self.render()
-
     async def loop_navi_left(self, duration: float) -> None:
         return
 
@@ -401,10 +602,15 @@ class MeasurementMenu(Menu):
 
 
 class SystemMenu(Menu):
+    TEMPLATE = b"   :  :         " b"     -  -       "
+
     CURSORS = (
         ((0, 0), (3, 0)),
         ((3, 0), (6, 0)),
         ((6, 0), (9, 0)),
+        ((0, 1), (5, 1)),
+        ((5, 1), (8, 1)),
+        ((8, 1), (11, 1)),
         ((11, 1), (13, 1)),
         ((13, 1), (15, 1)),
     )
@@ -412,27 +618,28 @@ class SystemMenu(Menu):
         (0, 23),
         (0, 59),
         (0, 59),
+        (2000, 2099),
+        (1, 12),
+        (1, 31),
     )
 
-    ALT_ICONS = True
-
-    ID_OK = 3
-    ID_CANCEL = 4
+    ID_OK = 6
+    ID_CANCEL = 7
 
     def __init__(self) -> None:
         super().__init__()
 
-        now = time.localtime()
+        now = clock.get_localtime()
         self.data = [now.tm_hour, now.tm_min, now.tm_sec]
+        self.data += [clamp(now.tm_year, 2000, 2099), now.tm_mon, now.tm_mday]
 
     def render(self) -> None:
-        ca, cb = self.get_cursor()
-
-        display.clear()
-        display.write((1, 0), format_time(self.data[0], self.data[1], self.data[2]))
-        display.write((12, 1), b"\x02 \x03")
-        display.write(ca, b"\x06")
-        display.write(cb, b"\x07")
+        display.clear(self.TEMPLATE)
+        display.write_time((1, 0), self.data[0], self.data[1], self.data[2])
+        display.write_date((1, 1), self.data[4], self.data[5], self.data[3])
+        display.write_char((12, 1), display.CHAR_OK)
+        display.write_char((14, 1), display.CHAR_CANCEL)
+        self.render_cursor()
         display.flush()
 
     async def loop_navi_enter(self, duration: float) -> None:
@@ -445,8 +652,11 @@ class SystemMenu(Menu):
         await super().loop_navi_enter(duration)
 
     def save(self) -> None:
-        h, m, s = self.data
-        rtc.datetime = time.struct_time((2000, 1, 1, h, m, s, 0, 0, -1))
+        h, m, s, year, month, day = self.data
+        day = min(day, get_days_in_month(year, month))
+
+        rtc.datetime = time.struct_time((year, month, day, h, m, s, 0, 0, -1))
+        clock.sync()
         logger.log(const.RTC_SAVE)
         scheduler.restart()
 
@@ -454,6 +664,9 @@ class SystemMenu(Menu):
 class HistoryMenu(Menu):
     MAX_VALUE = 98
 
+    # holding OK switches to the date mode, pressing it returns to the main menu
+    DATE_MODE_HOLD = 1.0
+
     def __init__(self) -> None:
         super().__init__()
         self.pos = self.MAX_VALUE
@@ -461,18 +674,89 @@ class HistoryMenu(Menu):
     def get_min_max_cursors(self) -> tuple[int, int]:
         return 0, self.MAX_VALUE
 
+    def get_day(self, log_id: int) -> int:
+        # entries without the date are treated as older than any other entry,
+        # so the days never increase with the log ID
+        day = logger.get(log_id).day
+        return -1 if day == logger.DAY_UNKNOWN else day
+
+    def find_first(self, day: int) -> int:
+        # find the oldest entry logged on the specified day or later
+        log_ids = range(self.MAX_VALUE + 1)
+        return bisect(log_ids, -day, lambda log_id: -self.get_day(log_id)) - 1
+
+    def render_date(self, day: int) -> None:
+        if day == logger.DAY_UNKNOWN:
+            display.write((1, 1), b"??-??")
+            return
+
+        _year, month, day = get_date(day)
+        display.write_date((1, 1), month, day)
+
     def render(self) -> None:
         entry = logger.get(self.MAX_VALUE - self.pos)
 
         display.clear()
-        display.write((8, 1), format_time(entry.hour, entry.minute, entry.second))
-        display.write((0, 0), _(entry.id)[:16].encode())
+        display.write_time((8, 1), entry.hour, entry.minute, entry.second)
+        display.write((0, 0), _(entry.id)[:16])
 
-        lo, hi = self.get_min_max_cursors()
-        display.write((0, 1), b"\x7F" if self.pos > lo else b" ")
-        display.write((1, 1), f"{self.pos + 1:02}".encode())
-        display.write((3, 1), b"\x7E" if self.pos < hi else b" ")
+        if self.edit:
+            display.write((0, 1), b"\x7F")
+            self.render_date(entry.day)
+            display.write((6, 1), b"\x7E")
+        else:
+            lo, hi = self.get_min_max_cursors()
+            display.write((0, 1), b"\x7F" if self.pos > lo else b" ")
+            display.write_number((1, 1), self.pos + 1, 2, display.ZERO)
+            display.write((3, 1), b"\x7E" if self.pos < hi else b" ")
+
+        display.flush()
+
+    async def loop_navi_enter(self, duration: float) -> None:
+        _ = duration
+        if await keys.wait_release(self.DATE_MODE_HOLD):
+            raise MenuExit()
+
+        self._enter_edit_mode()
+
+    def loop_edit_left(self, duration: float) -> None:
+        # jump to the first entry of the previous day
+        log_id = self.find_first(self.get_day(self.MAX_VALUE - self.pos)) + 1
+
+        if log_id <= self.MAX_VALUE:
+            log_id = self.find_first(self.get_day(log_id))
+            self.pos = self.MAX_VALUE - log_id
+
+    def loop_edit_right(self, duration: float) -> None:
+        # jump to the first entry of the next day
+        log_id = self.find_first(self.get_day(self.MAX_VALUE - self.pos) + 1)
 
+        if log_id >= 0:
+            self.pos = self.MAX_VALUE - log_id
+
+    def loop_edit_enter(self, duration: float) -> None:
+        # entries are browsed from the first one of the selected day
+        self._leave_edit_mode()
+
+
+class DiagnosticsMenu(Menu):
+    # counters are refreshed every second
+    SHOWS_TIME = True
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.data = sorted(i2c.stats)
+
+    def get_min_max_cursors(self) -> tuple[int, int]:
+        return 0, len(self.data) - 1
+
+    def render(self) -> None:
+        address = self.data[self.pos]
+        count, size, errors, time_us = i2c.stats[address]
+
+        display.clear()
+        display.write((0, 0), f"{address:02X} n{count:6} e{errors:4}"[:16].encode())
+        display.write((0, 1), f"b{size:7} {time_us // 1000:5}ms"[:16].encode())
         display.flush()
 
     async def loop_navi_enter(self, duration: float) -> None:
@@ -480,8 +764,15 @@ class HistoryMenu(Menu):
 
 
 async def loop() -> None:
+    wdt.start(wdt.MENU)
+
     menu = IdleMenu()
     menu.enter()
 
-    while True:
-        await menu.loop()
+    renderer.flush()
+    boot.stage("frame")
+
+    await asyncio.gather(run_forever(renderer.loop), run_forever(menu.loop))
+
+
+renderer = _Renderer()
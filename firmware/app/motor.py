@@ -0,0 +1,135 @@
+import board
+import time
+from digitalio import DigitalInOut, Direction
+
+from app import const
+from app.boot import boot
+from app.logger import logger
+from app.shared import log
+from app.watchdog import wdt
+
+
+class _Motor:
+    # action ID describes the first EEPROM address for its settings journal
+    ACT_OPEN = 512
+    ACT_CLOSE = 512 + 256
+
+    REASON_ONESHOT = 0
+    REASON_AUTO = 1
+    REASON_MEASURE = 2
+
+    def __init__(self) -> None:
+        self.lock = None
+
+        self._ch1 = DigitalInOut(board.GP18)
+        self._ch1.direction = Direction.OUTPUT
+        self._ch1.value = False
+
+        self._ch2 = DigitalInOut(board.GP19)
+        self._ch2.direction = Direction.OUTPUT
+        self._ch2.value = False
+
+        self._ch3 = DigitalInOut(board.GP20)
+        self._ch3.direction = Direction.OUTPUT
+        self._ch3.value = False
+
+        self._ch4 = DigitalInOut(board.GP21)
+        self._ch4.direction = Direction.OUTPUT
+        self._ch4.value = False
+
+    def sleep(self, duration: float) -> None:
+        loop_duration = wdt.TIMEOUT / 2
+
+        while duration > 0:
+            wdt.feed()
+            time.sleep(loop_duration if duration > loop_duration else duration)
+            duration -= loop_duration
+
+        wdt.feed()
+
+    async def asleep(self, duration: float) -> None:
+        loop_duration = 0.5
+        wdt.start(wdt.MOTOR)
+
+        try:
+            while duration > 0:
+                delay = loop_duration if duration > loop_duration else duration
+                await wdt.sleep(wdt.MOTOR, delay)
+                duration -= loop_duration
+        finally:
+            wdt.stop(wdt.MOTOR)
+
+    def open_start(self, reason_id: int) -> bool:
+        if self.lock:
+            return False
+
+        logger.log(const.ACT_OPEN_START + reason_id)
+
+        self.lock = object()
+        self._ch1.value = False
+        self._ch2.value = True
+
+        return True
+
+    def open_stop(self) -> None:
+        self._ch1.value = False
+        self._ch2.value = False
+        self.lock = None
+
+        logger.log(const.ACT_OPEN_STOP)
+
+    def open(self, reason_id: int, duration: float) -> None:
+        if not self.open_start(reason_id):
+            return
+
+        self.sleep(duration)
+        self.open_stop()
+
+    async def aopen(self, reason_id: int, duration: float) -> None:
+        if not self.open_start(reason_id):
+            return
+
+        try:
+            await self.asleep(duration)
+        finally:
+            self.open_stop()
+
+    def close_start(self, reason_id: int) -> bool:
+        if self.lock:
+            return False
+
+        logger.log(const.ACT_CLOSE_START + reason_id)
+
+        self.lock = object()
+        self._ch3.value = False
+        self._ch4.value = True
+
+        return True
+
+    def close_stop(self) -> None:
+        self._ch3.value = False
+        self._ch4.value = False
+        self.lock = None
+
+        logger.log(const.ACT_CLOSE_STOP)
+
+    def close(self, reason_id: int, duration: float) -> None:
+        if not self.close_start(reason_id):
+            return
+
+        self.sleep(duration)
+        self.close_stop()
+
+    async def aclose(self, reason_id: int, duration: float) -> None:
+        if not self.close_start(reason_id):
+            return
+
+        try:
+            await self.asleep(duration)
+        finally:
+            self.close_stop()
+
+
+motor = _Motor()
+log("Motor initialized")
+boot.stage("motor")
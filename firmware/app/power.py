@@ -0,0 +1,73 @@
+import alarm
+import supervisor
+import time
+
+from app import const
+from app.boot import boot
+from app.clock import clock
+from app.keys import KEY_PINS, keys
+from app.logger import logger
+from app.scheduler import scheduler
+from app.shared import get_idle_delay
+from app.watchdog import wdt
+
+
+class _Alarm:
+    def sleep(self, timeout: float, pins: tuple) -> bool:
+        # light sleep until the timeout, or until any of the pins is pulled low;
+        # returns True if the device was woken up by a pin
+        alarms = [alarm.time.TimeAlarm(monotonic_time=time.monotonic() + timeout)]
+        alarms += [alarm.pin.PinAlarm(pin, value=False, pull=True) for pin in pins]
+
+        woken = alarm.light_sleep_until_alarms(*alarms)
+        return isinstance(woken, alarm.pin.PinAlarm)
+
+
+class _Power:
+    MIN_DELAY = 0.1
+
+    def __init__(self) -> None:
+        self.alarm = _Alarm()
+
+    def can_sleep(self) -> bool:
+        # serial console would not be able to receive any commands
+        if supervisor.runtime.serial_connected:
+            return False
+        if not boot.ready.is_set():
+            return False
+
+        return not scheduler.job and keys.get_idle_time() >= const.IDLE_TIMEOUT
+
+    def get_sleep_delay(self) -> float:
+        task_ts = scheduler.timestamps[0] if scheduler.count else None
+        max_delay = wdt.TIMEOUT / 2 if wdt.enabled else const.MINUTE
+
+        return get_idle_delay(
+            clock.get_time(), clock.get_second_delay(), task_ts, max_delay
+        )
+
+    def sleep(self) -> bool:
+        # not worth it if the next task is just about to run
+        delay = self.get_sleep_delay()
+        if delay < self.MIN_DELAY:
+            return False
+
+        # every other task is suspended while sleeping
+        logger.flush()
+        wdt.check_in(wdt.MENU)
+        keys.stop()
+
+        try:
+            woken = self.alarm.sleep(delay, KEY_PINS)
+        finally:
+            keys.start()
+
+        wdt.resume(wdt.MENU)
+
+        if woken:
+            keys.touch()
+
+        return True
+
+
+power = _Power()
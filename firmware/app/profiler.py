@@ -0,0 +1,70 @@
+import supervisor
+from array import array
+
+from adafruit_ticks import ticks_diff
+
+from app.shared import get_percentile
+
+
+class _Profiler:
+    MENU = 0
+    SCHEDULER = 1
+    DISPLAY = 2
+    LOGGER = 3
+    SCRUB = 4
+    LATENCY = 5
+
+    NAMES = ("menu", "scheduler", "display", "logger", "scrub", "latency")
+
+    SAMPLE_COUNT = 128
+    MAX_SAMPLE = 65535
+    NO_START = -1
+
+    def __init__(self) -> None:
+        self.enabled = False
+
+        # durations (in milliseconds) are stored in preallocated ring buffers,
+        # one for each hook, so recording them does not allocate any memory
+        self.samples = array("H", [0] * len(self.NAMES) * self.SAMPLE_COUNT)
+        self.totals = array("L", [0] * len(self.NAMES))
+        self.starts = array("l", [self.NO_START] * len(self.NAMES))
+
+    def set_enabled(self, enabled: bool) -> None:
+        for hook in range(len(self.NAMES)):
+            self.totals[hook] = 0
+            self.starts[hook] = self.NO_START
+
+        self.enabled = enabled
+
+    def begin(self, hook: int, ticks: int | None = None) -> None:
+        if self.enabled:
+            self.starts[hook] = supervisor.ticks_ms() if ticks is None else ticks
+
+    def cancel(self, hook: int) -> None:
+        self.starts[hook] = self.NO_START
+
+    def end(self, hook: int) -> None:
+        # only the first end() after begin() is recorded
+        if not self.enabled or self.starts[hook] == self.NO_START:
+            return
+
+        duration = ticks_diff(supervisor.ticks_ms(), self.starts[hook])
+        self.starts[hook] = self.NO_START
+
+        total = self.totals[hook]
+        index = hook * self.SAMPLE_COUNT + total % self.SAMPLE_COUNT
+        self.samples[index] = min(max(duration, 0), self.MAX_SAMPLE)
+        self.totals[hook] = total + 1
+
+    def get_summary(self, hook: int) -> tuple[int, float, int, int] | None:
+        # min, mean, p99 and max of the recent samples, sorted on demand
+        first = hook * self.SAMPLE_COUNT
+        count = min(self.totals[hook], self.SAMPLE_COUNT)
+        if not count:
+            return None
+
+        values = sorted(self.samples[first : first + count])
+        return values[0], sum(values) / count, get_percentile(values, 99), values[-1]
+
+
+profiler = _Profiler()
@@ -0,0 +1,187 @@
+from array import array
+
+from app import const
+from app.clock import clock
+from app.logger import logger
+from app.motor import motor
+from app.profiler import profiler
+from app.settings import settings
+from app.shared import bisect, get_next_timestamp, get_time_offsets
+from app.types import SettingsT
+from app.watchdog import wdt
+
+
+class _Scheduler:  # pylint:disable=too-many-instance-attributes
+    # delay before any task can be run after restart
+    DELAY = 5 * const.SECOND
+
+    # actions are stored in the task table by their index
+    ACTION_IDS = (motor.ACT_OPEN, motor.ACT_CLOSE)
+
+    def __init__(self) -> None:
+        # pending tasks, always sorted by timestamp; only the first count items
+        # are valid, so the columns are reused when the tasks are rescheduled
+        self.timestamps = array("l")
+        self.actions = array("B")
+        self.durations = array("l")
+        self.count = 0
+
+        # function for each action, called with the reason and duration
+        self.functions = (motor.aopen, motor.aclose)
+
+        # settings and time offsets for each action, keyed by action ID;
+        # offsets are only recalculated when the settings are changed
+        self.timetables = {}
+
+        # action ID of the running task
+        self.job = None
+        self.job_time = 0
+
+    def start(self) -> None:
+        if self.restart():
+            logger.log(const.SCHEDULER_INIT)
+
+    def restart(self, action_id: int | None = None) -> bool:
+        # rebuild tasks for a single action if its settings were changed,
+        # or for all actions if the clock was changed
+
+        if clock.lost_power:
+            logger.log(const.SCHEDULER_ERROR)
+            self.count = 0
+            return False
+
+        now_ts = clock.get_time()
+        day_sec = now_ts % const.DAY
+
+        if action_id is None:
+            action_ids = self.ACTION_IDS
+            self.count = 0
+        else:
+            action_ids = (action_id,)
+            self.remove_action(self.ACTION_IDS.index(action_id))
+
+        for aid in action_ids:
+            timetable = self.get_timetable(aid)
+            self.push_action(aid, timetable, now_ts, day_sec)
+
+        return True
+
+    def push(self, timestamp: int, action: int, duration: int) -> None:
+        if self.count == len(self.timestamps):
+            self.timestamps.append(0)
+            self.actions.append(0)
+            self.durations.append(0)
+
+        idx = bisect(self.timestamps, timestamp, hi=self.count)
+
+        for dst in range(self.count, idx, -1):
+            self.timestamps[dst] = self.timestamps[dst - 1]
+            self.actions[dst] = self.actions[dst - 1]
+            self.durations[dst] = self.durations[dst - 1]
+
+        self.timestamps[idx] = timestamp
+        self.actions[idx] = action
+        self.durations[idx] = duration
+        self.count += 1
+
+    def remove(self, idx: int) -> None:
+        self.count -= 1
+
+        for dst in range(idx, self.count):
+            self.timestamps[dst] = self.timestamps[dst + 1]
+            self.actions[dst] = self.actions[dst + 1]
+            self.durations[dst] = self.durations[dst + 1]
+
+    def remove_action(self, action: int) -> None:
+        count = 0
+
+        for src in range(self.count):
+            if self.actions[src] == action:
+                continue
+
+            self.timestamps[count] = self.timestamps[src]
+            self.actions[count] = self.actions[src]
+            self.durations[count] = self.durations[src]
+            count += 1
+
+        self.count = count
+
+    def get_tasks(self) -> list[tuple[int, int]]:
+        # copy of the pending tasks, as action ID and timestamp pairs
+        return [
+            (self.ACTION_IDS[self.actions[idx]], self.timestamps[idx])
+            for idx in range(self.count)
+        ]
+
+    def get_timetable(self, action_id: int) -> tuple[SettingsT, list[int]]:
+        # settings tuple is the fingerprint of the timetable
+        timetable = self.timetables.get(action_id)
+        motor_settings = settings.load(action_id)
+        if timetable and timetable[0] == motor_settings:
+            return timetable
+
+        timetable = motor_settings, get_time_offsets(motor_settings)
+        self.timetables[action_id] = timetable
+        return timetable
+
+    def push_action(
+        self,
+        action_id: int,
+        timetable: tuple[SettingsT, list[int]],
+        now_ts: int,
+        day_sec: int,
+    ) -> None:
+        motor_settings, offsets = timetable
+
+        action = self.ACTION_IDS.index(action_id)
+        duration = round(motor_settings.duration_single * 1000)
+
+        for offset in offsets:
+            ts = get_next_timestamp(now_ts + self.DELAY, day_sec + self.DELAY, offset)
+            self.push(ts, action, duration)
+
+    async def loop(self) -> None:
+        # jobs are not profiled, other tasks can run while they are waiting
+        profiler.begin(profiler.SCHEDULER)
+
+        now = clock.get_time()
+
+        while self.count and self.timestamps[0] <= now:
+            # reschedule first, the table can be rebuilt while the job is running
+            timestamp, action, duration = (
+                self.timestamps[0],
+                self.actions[0],
+                self.durations[0],
+            )
+            self.remove(0)
+            self.push(timestamp + const.DAY, action, duration)
+
+            profiler.end(profiler.SCHEDULER)
+            await self.run(action, duration)
+            profiler.begin(profiler.SCHEDULER)
+
+            now = clock.get_time()
+
+        # sleep until the next task is due, but wake up in time to feed the watchdog
+        delay = wdt.TIMEOUT / 2
+        if self.count:
+            delay = max(min(delay, self.timestamps[0] - now), 0)
+
+        profiler.end(profiler.SCHEDULER)
+        await wdt.sleep(wdt.SCHEDULER, delay)
+
+    async def run(self, action: int, duration: int) -> None:
+        self.job = self.ACTION_IDS[action]
+        self.job_time = clock.get_time()
+
+        # the job is monitored on its own while the scheduler is waiting for it
+        wdt.stop(wdt.SCHEDULER)
+
+        try:
+            await self.functions[action](motor.REASON_AUTO, duration / 1000)
+        finally:
+            self.job = None
+            wdt.start(wdt.SCHEDULER)
+
+
+scheduler = _Scheduler()
@@ -0,0 +1,185 @@
+import asyncio
+
+from app import const
+from app.eeprom import eeprom
+from app.logger import logger
+from app.motor import motor
+from app.profiler import profiler
+from app.shared import find_head, get_checksum, log, verify_checksum
+from app.types import SettingsT
+
+
+class _Settings:
+    ACTION_IDS = (motor.ACT_OPEN, motor.ACT_CLOSE)
+
+    DEFAULTS = SettingsT(0, 0, 0, 0, 0, 1)
+
+    VERSION = 4
+    HEADER = bytearray((80, 73, 67, VERSION))
+
+    # each action has its own journal, every save appends a new record to it
+    # so the writes are spread over all slots, and the newest valid record is used;
+    # record consists of 16-bit sequence number (little endian), settings,
+    # padding and checksum, and it never crosses the EEPROM page boundary
+    JOURNAL_SIZE = 256
+    RECORD_SIZE = 16
+    SLOT_COUNT = JOURNAL_SIZE // RECORD_SIZE
+    SEQ_MODULO = 1 << 16
+
+    # version 2 settings were stored at fixed addresses, without sequence numbers
+    V2_ADDRESSES = (512, 512 + 8)
+
+    def __init__(self) -> None:
+        # slot for the next write, and its sequence number, for each action
+        self.heads = {}
+
+        # settings in use, loaded at boot and updated on every save, so they
+        # do not have to be read from EEPROM every time
+        self.cache = {}
+
+        # action whose record is verified next by the scrubber
+        self.scrub_idx = 0
+
+    def start(self) -> None:
+        header = eeprom[0 : len(self.HEADER)]
+        if header == self.HEADER:
+            self.find_heads()
+        elif header[:-1] == self.HEADER[:-1] and header[-1] < self.VERSION:
+            # handle upgrade from the older EEPROM layout
+            self.migrate(header[-1])
+            eeprom[0 : len(self.HEADER)] = self.HEADER
+        else:
+            # handle first boot
+            eeprom[0 : len(self.HEADER)] = self.HEADER
+            self.find_heads()
+            self.reset()
+
+        self.fill_cache()
+
+    def find_heads(self) -> None:
+        for action_id in self.ACTION_IDS:
+            get_seq = lambda slot, a=action_id: self.get_seq(a, slot)
+
+            slot = find_head(self.SLOT_COUNT, get_seq, self.SEQ_MODULO)
+            last_seq = get_seq((slot - 1) % self.SLOT_COUNT)
+
+            seq = 0 if last_seq is None else (last_seq + 1) % self.SEQ_MODULO
+            self.heads[action_id] = slot, seq
+
+    def get_seq(self, action_id: int, slot: int) -> int | None:
+        raw = self.read(action_id, slot)
+
+        if not verify_checksum(raw):
+            return None
+
+        return raw[0] + raw[1] * 256
+
+    def read(self, action_id: int, slot: int) -> bytearray:
+        first = action_id + slot * self.RECORD_SIZE
+        return eeprom[first : first + self.RECORD_SIZE]
+
+    def get_last(self, action_id: int) -> tuple[int, int]:
+        # slot of the newest record, and its sequence number
+        slot, seq = self.heads[action_id]
+        return (slot - 1) % self.SLOT_COUNT, (seq - 1) % self.SEQ_MODULO
+
+    def fill_cache(self) -> None:
+        for action_id in self.ACTION_IDS:
+            raw = self.read(action_id, self.get_last(action_id)[0])
+
+            if verify_checksum(raw):
+                self.cache[action_id] = SettingsT(
+                    raw[2], raw[3], raw[4], raw[5], raw[6] + raw[7] * 256, raw[8]
+                )
+            else:
+                logger.log(const.SETTINGS_ERROR)
+                self.cache[action_id] = self.DEFAULTS
+
+    def load(self, action_id: int) -> SettingsT:
+        return self.cache[action_id]
+
+    def save(self, action_id: int, obj: SettingsT) -> None:
+        self.save_nolog(action_id, obj)
+        logger.log(const.SETTINGS_SAVE)
+
+    def save_nolog(self, action_id: int, obj: SettingsT) -> None:
+        slot, seq = self.heads[action_id]
+
+        # a record torn by the power loss will fail the checksum verification,
+        # and the previous one will be used instead
+        self.write(action_id, slot, self.encode(seq, obj))
+        self.cache[action_id] = obj
+
+        slot = (slot + 1) % self.SLOT_COUNT
+        seq = (seq + 1) % self.SEQ_MODULO
+        self.heads[action_id] = slot, seq
+
+    def encode(self, seq: int, obj: SettingsT) -> bytearray:
+        raw = [seq % 256, seq // 256]
+        raw += [obj[0], obj[1], obj[2], obj[3], obj[4] % 256, obj[4] // 256, obj[5]]
+        raw += [0] * (self.RECORD_SIZE - len(raw) - 1)
+        raw.append(get_checksum(raw))
+
+        return bytearray(raw)
+
+    def write(self, action_id: int, slot: int, raw: bytearray) -> None:
+        eeprom.write_page(action_id + slot * self.RECORD_SIZE, raw)
+
+    def scrub(self) -> None:
+        # newest record of one action is verified at a time, and written again
+        # in place if it does not match the settings in use
+        profiler.begin(profiler.SCRUB)
+
+        action_id = self.ACTION_IDS[self.scrub_idx]
+        self.scrub_idx = (self.scrub_idx + 1) % len(self.ACTION_IDS)
+
+        slot, seq = self.get_last(action_id)
+        raw = self.encode(seq, self.cache[action_id])
+
+        if self.read(action_id, slot) != raw:
+            self.write(action_id, slot, raw)
+            logger.log(const.SETTINGS_REPAIR)
+
+        profiler.end(profiler.SCRUB)
+
+    async def loop(self) -> None:
+        await asyncio.sleep(const.SCRUB_INTERVAL)
+
+        # motor timing is more important, try again later
+        if not motor.lock:
+            self.scrub()
+
+    def reset(self) -> None:
+        self.save_nolog(motor.ACT_OPEN, self.DEFAULTS)
+        self.save_nolog(motor.ACT_CLOSE, self.DEFAULTS)
+        logger.log(const.SETTINGS_RESET)
+
+    def migrate(self, version: int) -> None:
+        logger.migrate(version)
+
+        if version < 3:
+            self.migrate_v2()
+
+        self.find_heads()
+
+    def migrate_v2(self) -> None:
+        log("Migrating settings from version 2")
+
+        old = [eeprom[address : address + 8] for address in self.V2_ADDRESSES]
+        self.heads = {motor.ACT_OPEN: (0, 0), motor.ACT_CLOSE: (0, 0)}
+
+        # closing settings are written first, as the old records are stored
+        # in the first slot of the opening journal
+        for action_id, raw in ((motor.ACT_CLOSE, old[1]), (motor.ACT_OPEN, old[0])):
+            if verify_checksum(raw):
+                obj = SettingsT(
+                    raw[0], raw[1], raw[2], raw[3], raw[4] + raw[5] * 256, raw[6]
+                )
+                self.save_nolog(action_id, obj)
+            else:
+                eeprom[action_id : action_id + self.RECORD_SIZE] = bytearray(
+                    self.RECORD_SIZE
+                )
+
+
+settings = _Settings()
@@ -1,14 +1,50 @@
 import math
 import time
 
+try:
+    from typing import Iterator
+except ImportError:
+    pass
+
 from app import const
 from app.types import SettingsT
 
 BASE_CHECKSUM = 42
 
+# number of days from 0000-03-01 to 2000-01-01 in the proleptic Gregorian calendar
+DAYS_BEFORE_2000 = 730425
+
+
+def _(text_id: int) -> memoryview:
+    # encoded text, ready to be written to the display
+    blob = const.TRANSLATIONS
+    first = text_id * 2
+
+    if first + 4 <= len(blob):
+        start = blob[first] + blob[first + 1] * 256
+        end = blob[first + 2] + blob[first + 3] * 256
+
+        if start < end:
+            return blob[start:end]
 
-def _(text_id: int) -> str:
-    return const.TRANSLATIONS.get(const.LANG, {}).get(text_id, f"{text_id}?")
+    return memoryview(f"{text_id}?".encode())
+
+
+def bisect(items, value: int, key=None, hi: int | None = None) -> int:
+    # find the rightmost insertion point, so items with equal keys stay in order;
+    # only the first hi items are searched
+    lo = 0
+    if hi is None:
+        hi = len(items)
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if value < (items[mid] if key is None else key(items[mid])):
+            hi = mid
+        else:
+            lo = mid + 1
+
+    return lo
 
 
 def chunk(items: list, size: int) -> list[tuple]:
@@ -20,11 +56,25 @@ def clamp(value: int, low: int, hi: int) -> int:
     return max(min(value, hi), low)
 
 
-def format_time(hour: int, minute: int, second: int | None = None) -> bytes:
-    if second is None:
-        return f"{hour:02}:{minute:02}".encode()
+def find_head(count: int, get_seq, modulo: int) -> int:
+    # frames are written in order, each one with a sequence number higher by one,
+    # so the first frame breaking the sequence is the location for the next write;
+    # get_seq should return None for frames that are empty or corrupted
+
+    first = get_seq(0)
+    if first is None:
+        return 0
 
-    return f"{hour:02}:{minute:02}:{second:02}".encode()
+    lo, hi = 1, count
+
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if get_seq(mid) == (first + mid) % modulo:
+            lo = mid + 1
+        else:
+            hi = mid
+
+    return lo % count
 
 
 def get_checksum(data: list[int]) -> int:
@@ -50,15 +100,106 @@ def get_time_offsets(settings: SettingsT) -> list[int]:
         last_sec += const.DAY
 
     total_distance = last_sec - first_sec
-    distance = total_distance / (settings.divided_by - 1)
+    steps = settings.divided_by - 1
 
     offsets = []
     for idx in range(settings.divided_by):
-        offsets.append(round(first_sec + idx * distance) % const.DAY)
+        # integer equivalent of round(first_sec + idx * total_distance / steps)
+        offset = first_sec + (2 * idx * total_distance + steps) // (2 * steps)
+        offsets.append(offset % const.DAY)
 
     return offsets
 
 
+def get_date(day_number: int) -> tuple[int, int, int]:
+    # inverse of get_day_number, returns year, month and day
+    z = day_number + DAYS_BEFORE_2000
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+
+    day = doy - (153 * mp + 2) // 5 + 1
+    month = mp + 3 if mp < 10 else mp - 9
+    year = yoe + era * 400 + (month <= 2)
+
+    return year, month, day
+
+
+def get_day_number(year: int, month: int, day: int) -> int:
+    # number of days since 2000-01-01, calculated without any calls to the RTC;
+    # years start in March, so the leap day is the last day of a year
+    y = year - (month <= 2)
+    era = y // 400
+    yoe = y - era * 400
+    doy = (153 * (month - 3 if month > 2 else month + 9) + 2) // 5 + day - 1
+    doe = yoe * 365 + yoe // 4 - yoe // 100 + doy
+
+    return era * 146097 + doe - DAYS_BEFORE_2000
+
+
+def get_days_in_month(year: int, month: int) -> int:
+    next_year, next_month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return get_day_number(next_year, next_month, 1) - get_day_number(year, month, 1)
+
+
+def get_idle_delay(
+    now_ts: int, second_delay: float, task_ts: int | None, max_delay: float
+) -> float:
+    # wake up when the displayed minute changes, or when the next task is due;
+    # now_ts is incremented after second_delay
+    delay = const.MINUTE - 1 - now_ts % const.MINUTE + second_delay
+
+    if task_ts is not None:
+        delay = min(delay, task_ts - now_ts - 1 + second_delay)
+
+    return max(min(delay, max_delay), 0)
+
+
+def get_next_timestamp(now_ts: int, day_sec: int, offset: int) -> int:
+    # day_sec is the number of seconds since midnight at now_ts,
+    # so the next occurrence of the offset is never more than one day ahead
+    return now_ts + (offset - day_sec) % const.DAY
+
+
+def get_log_duration(frame) -> int:
+    # duration stored in the log frame, in milliseconds
+    units = (frame[1] >> 5) << 4 | (frame[2] >> 6) << 2 | frame[3] >> 6
+    return units * const.LOG_DURATION_UNIT
+
+
+def get_percentile(values: list[int], percent: int) -> int:
+    # nearest-rank method, values must be sorted and not empty
+    rank = -(-len(values) * percent // 100)
+    return values[max(rank, 1) - 1]
+
+
+def iter_log(storage, first_byte: int, last_byte: int) -> Iterator[str]:
+    # whole log region is read at once, then the frames are printed as stored,
+    # one at a time, starting from the oldest one; frames which fail the checksum
+    # verification, including the empty ones, are marked with "!" and decoding
+    # is left to the host; storage can be any object that supports reading
+    # slices, such as EEPROM_I2C
+    raw = memoryview(storage[first_byte:last_byte])
+    size = const.LOG_FRAME_SIZE
+    count = (last_byte - first_byte) // size
+
+    def get_frame(frame_id: int) -> memoryview:
+        return raw[frame_id * size : (frame_id + 1) * size]
+
+    def get_seq(frame_id: int) -> int | None:
+        frame = get_frame(frame_id)
+        return frame[4] if verify_checksum(frame) else None
+
+    head = find_head(count, get_seq, const.LOG_SEQ_MODULO)
+
+    for idx in range(count):
+        frame = get_frame((head + idx) % count)
+        line = " ".join(f"{value:02x}" for value in frame)
+        yield line if verify_checksum(frame) else f"{line} !"
+
+
 def log(message: str) -> None:
     print(f"[{time.monotonic():10.2f}] {message}")
 
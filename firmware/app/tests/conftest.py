@@ -0,0 +1,29 @@
+import pytest
+
+from decode_log import decode_frame
+from sim import Simulator
+from translations import TRANSLATIONS
+
+
+@pytest.fixture
+def sim(monkeypatch):
+    simulator = Simulator(monkeypatch)
+    yield simulator
+    simulator.close()
+
+
+@pytest.fixture
+def read_log(sim, capsys):  # pylint:disable=redefined-outer-name
+    # log is printed as raw frames, the valid ones are decoded like on the host
+    def read() -> list[str]:
+        capsys.readouterr()
+        sim.serial.write("log\n")
+        sim.run(sim.core.console.IDLE_POLL_INTERVAL)
+
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[-1] == "END"
+
+        texts = [decode_frame(line, TRANSLATIONS["en"]) for line in lines]
+        return [text for text in texts if text is not None]
+
+    return read
@@ -0,0 +1,26 @@
+from app.shared import bisect
+
+
+def test_bisect_empty():
+    assert bisect([], 10, lambda x: x) == 0
+
+
+def test_bisect_middle():
+    assert bisect([1, 5, 9], 6, lambda x: x) == 2
+
+
+def test_bisect_keeps_equal_items_in_order():
+    items = [(1, "a"), (5, "b"), (5, "c"), (9, "d")]
+
+    assert bisect(items, 5, lambda x: x[0]) == 3
+
+
+def test_bisect_bounds():
+    items = [3, 4, 5]
+
+    assert bisect(items, 0, lambda x: x) == 0
+    assert bisect(items, 10, lambda x: x) == 3
+
+
+def test_bisect_searches_only_the_first_items():
+    assert bisect([1, 5, 9, 0, 0], 6, hi=3) == 2
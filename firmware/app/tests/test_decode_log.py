@@ -0,0 +1,41 @@
+from app.shared import get_checksum, get_day_number
+from decode_log import decode_frame
+from translations import TRANSLATIONS
+
+
+def encode(values: list[int]) -> str:
+    return " ".join(f"{value:02x}" for value in values + [get_checksum(values)])
+
+
+def test_frame_is_decoded():
+    day = get_day_number(2026, 10, 18)
+    line = encode([32, 12, 3, 0, 3, day % 256, day // 256])
+
+    assert decode_frame(line, TRANSLATIONS["en"]) == (
+        f"2026-10-18 12:03:00  32 {TRANSLATIONS['en'][32]}"
+    )
+
+
+def test_unknown_date():
+    line = encode([35, 8, 30, 15, 0, 255, 255])
+
+    assert decode_frame(line, TRANSLATIONS["pl"]) == (
+        f"????-??-?? 08:30:15  35 {TRANSLATIONS['pl'][35]}"
+    )
+
+
+def test_duration_is_decoded():
+    # 12.5 seconds, stored in the highest bits of the time
+    units = 125
+    hms = [23 | units >> 4 << 5, 59 | (units >> 2 & 3) << 6, 58 | (units & 3) << 6]
+    line = encode([44] + hms + [7, 255, 255])
+
+    assert decode_frame(line, TRANSLATIONS["en"]) == (
+        f"????-??-?? 23:59:58  44 {TRANSLATIONS['en'][44]} (12500 ms)"
+    )
+
+
+def test_invalid_frames_are_skipped():
+    assert decode_frame("ff ff ff ff ff ff ff ff !", TRANSLATIONS["en"]) is None
+    assert decode_frame("00 01 02 03 04 05 06 07", TRANSLATIONS["en"]) is None
+    assert decode_frame("END", TRANSLATIONS["en"]) is None
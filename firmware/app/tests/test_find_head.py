@@ -0,0 +1,43 @@
+from app.shared import find_head
+
+MODULO = 1 << 24
+
+
+def get_seq_fn(frames: list[int | None]):
+    return lambda frame_id: frames[frame_id]
+
+
+def test_empty():
+    frames = [None] * 16
+
+    assert find_head(16, get_seq_fn(frames), MODULO) == 0
+
+
+def test_partially_filled():
+    frames = [0, 1, 2, 3, 4] + [None] * 11
+
+    assert find_head(16, get_seq_fn(frames), MODULO) == 5
+
+
+def test_full():
+    frames = list(range(100, 116))
+
+    assert find_head(16, get_seq_fn(frames), MODULO) == 0
+
+
+def test_wraparound():
+    frames = list(range(16, 22)) + list(range(6, 16))
+
+    assert find_head(16, get_seq_fn(frames), MODULO) == 6
+
+
+def test_sequence_overflow():
+    frames = [MODULO - 2, MODULO - 1, 0, 1] + list(range(MODULO - 14, MODULO - 2))
+
+    assert find_head(16, get_seq_fn(frames), MODULO) == 4
+
+
+def test_torn_write():
+    frames = list(range(16, 22)) + [None] + list(range(7, 16))
+
+    assert find_head(16, get_seq_fn(frames), MODULO) == 6
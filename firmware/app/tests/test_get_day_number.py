@@ -0,0 +1,31 @@
+import datetime
+
+from app.shared import get_date, get_day_number, get_days_in_month
+
+
+def test_epoch():
+    assert get_day_number(2000, 1, 1) == 0
+    assert get_date(0) == (2000, 1, 1)
+
+
+def test_leap_day():
+    assert get_day_number(2024, 3, 1) - get_day_number(2024, 2, 28) == 2
+    assert get_date(get_day_number(2024, 2, 29)) == (2024, 2, 29)
+
+
+def test_matches_datetime():
+    epoch = datetime.date(2000, 1, 1)
+
+    for day_number in range(-400, 40000, 7):
+        date = epoch + datetime.timedelta(days=day_number)
+
+        assert get_day_number(date.year, date.month, date.day) == day_number
+        assert get_date(day_number) == (date.year, date.month, date.day)
+
+
+def test_days_in_month():
+    assert get_days_in_month(2023, 2) == 28
+    assert get_days_in_month(2024, 2) == 29
+    assert get_days_in_month(2100, 2) == 28
+    assert get_days_in_month(2024, 4) == 30
+    assert get_days_in_month(2024, 12) == 31
@@ -0,0 +1,26 @@
+from app import const
+from app.shared import get_idle_delay
+
+
+def test_get_idle_delay_next_minute():
+    now_ts = 10 * const.MINUTE + 50
+
+    assert get_idle_delay(now_ts, 0.25, None, const.MINUTE) == 9.25
+
+
+def test_get_idle_delay_next_task():
+    now_ts = 10 * const.MINUTE + 20
+
+    assert get_idle_delay(now_ts, 0.25, now_ts + 5, const.MINUTE) == 4.25
+
+
+def test_get_idle_delay_max_delay():
+    now_ts = 10 * const.MINUTE
+
+    assert get_idle_delay(now_ts, 0.5, None, 4.0) == 4.0
+
+
+def test_get_idle_delay_task_due():
+    now_ts = 10 * const.MINUTE
+
+    assert get_idle_delay(now_ts, 0.5, now_ts - 5, const.MINUTE) == 0
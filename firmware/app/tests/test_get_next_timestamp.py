@@ -0,0 +1,33 @@
+from app.const import DAY, HOUR, MINUTE
+from app.shared import get_next_timestamp
+
+MIDNIGHT = 1_000 * DAY
+
+
+def test_later_today():
+    now = MIDNIGHT + 8 * HOUR
+    actual = get_next_timestamp(now, 8 * HOUR, 9 * HOUR + 30 * MINUTE)
+
+    assert actual == MIDNIGHT + 9 * HOUR + 30 * MINUTE
+
+
+def test_tomorrow():
+    now = MIDNIGHT + 10 * HOUR
+    actual = get_next_timestamp(now, 10 * HOUR, 9 * HOUR + 30 * MINUTE)
+
+    assert actual == MIDNIGHT + DAY + 9 * HOUR + 30 * MINUTE
+
+
+def test_now():
+    now = MIDNIGHT + 10 * HOUR
+    actual = get_next_timestamp(now, 10 * HOUR, 10 * HOUR)
+
+    assert actual == now
+
+
+def test_past_midnight():
+    # day_sec may exceed a day if an extra delay was added
+    now = MIDNIGHT + DAY + 3
+    actual = get_next_timestamp(now, DAY + 3, 0)
+
+    assert actual == MIDNIGHT + 2 * DAY
@@ -0,0 +1,19 @@
+from app.shared import get_percentile
+
+
+def test_get_percentile():
+    values = list(range(1, 101))
+
+    assert get_percentile(values, 50) == 50
+    assert get_percentile(values, 99) == 99
+    assert get_percentile(values, 100) == 100
+
+
+def test_get_percentile_rounds_rank_up():
+    assert get_percentile([1, 2, 3], 50) == 2
+    assert get_percentile([1, 2, 3], 99) == 3
+
+
+def test_get_percentile_single_value():
+    assert get_percentile([7], 1) == 7
+    assert get_percentile([7], 99) == 7
@@ -0,0 +1,55 @@
+from app.shared import get_checksum, get_day_number, iter_log
+
+FIRST_BYTE = 1024
+LAST_BYTE = 1024 + 8 * 8
+
+
+class FakeEEPROM:
+    def __init__(self) -> None:
+        self.data = bytearray(b"\xFF" * 2048)
+        self.reads = 0
+
+    def __getitem__(self, key: slice) -> bytearray:
+        self.reads += 1
+        return self.data[key]
+
+    def write_frame(self, frame_id: int, values: list[int]) -> None:
+        values = values + [get_checksum(values)]
+        first = FIRST_BYTE + frame_id * 8
+        self.data[first : first + 8] = bytes(values)
+
+
+def test_empty():
+    eeprom = FakeEEPROM()
+
+    lines = list(iter_log(eeprom, FIRST_BYTE, LAST_BYTE))
+
+    assert lines == ["ff ff ff ff ff ff ff ff !"] * 8
+
+
+def test_oldest_first():
+    day = get_day_number(2026, 10, 18)
+    eeprom = FakeEEPROM()
+
+    # ring of 8 frames, the first three ones were overwritten
+    for frame_id, seq in enumerate([8, 9, 10, 3, 4, 5, 6, 7]):
+        eeprom.write_frame(frame_id, [32, 12, seq, 0, seq, day % 256, day // 256])
+
+    lines = list(iter_log(eeprom, FIRST_BYTE, LAST_BYTE))
+
+    assert len(lines) == 8
+    assert [int(line.split()[4], 16) for line in lines] == list(range(3, 11))
+    assert eeprom.reads == 1
+
+
+def test_frames_are_printed_as_stored():
+    eeprom = FakeEEPROM()
+    eeprom.write_frame(0, [35, 8, 30, 15, 0, 255, 255])
+    eeprom.data[FIRST_BYTE + 8 : FIRST_BYTE + 16] = bytes(range(8))
+
+    lines = list(iter_log(eeprom, FIRST_BYTE, LAST_BYTE))
+
+    # the newest frame is the last one
+    checksum = get_checksum([35, 8, 30, 15, 0, 255, 255])
+    assert lines[0] == "00 01 02 03 04 05 06 07 !"
+    assert lines[-1] == f"23 08 1e 0f 00 ff ff {checksum:02x}"
@@ -0,0 +1,10 @@
+import pytest
+
+from sim.bench import WORKLOADS, get_regressions, load_baseline, measure
+
+
+@pytest.mark.parametrize("name", WORKLOADS)
+def test_workload_does_not_regress(sim, name):
+    results = {name: measure(sim, name)}
+
+    assert not get_regressions(results, load_baseline())
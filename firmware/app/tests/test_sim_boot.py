@@ -0,0 +1,46 @@
+def test_idle_screen_is_shown_before_settings_are_loaded(sim):
+    sim.set_time(2024, 5, 6, 7, 0, 0)
+    sim.boot()
+
+    shown_at = next(ts for ts, rows in sim.lcd.frames if rows[0].startswith(b"07:00"))
+    assert shown_at < sim.clock.now
+
+    names = [name for name, _ in sim.core.boot.stages]
+    assert names.index("frame") < names.index("log") < names.index("settings")
+
+
+def test_boot_report_is_printed(sim, capsys):
+    sim.boot()
+    sim.run(1)
+
+    capsys.readouterr()
+    sim.serial.write("boot\n")
+    sim.run(sim.core.console.IDLE_POLL_INTERVAL)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines[:-1]] == [
+        name for name, _ in sim.core.boot.stages
+    ]
+    assert lines[-1] == "END"
+
+
+def test_idle_screen_is_updated_while_loading(sim):
+    sim.set_time(2024, 5, 6, 6, 59, 59)
+
+    # slow EEPROM, the next second begins while the log and settings are loaded
+    reads = []
+    read = sim.eeprom.read
+
+    def slow_read(length: int) -> bytes:
+        sim.clock.advance(0.6)
+        reads.append(sim.clock.now)
+        return read(length)
+
+    sim.monkeypatch.setattr(sim.eeprom, "read", slow_read)
+    sim.boot()
+
+    assert reads[-1] - reads[0] > 1
+    shown_at = next(
+        ts for ts, rows in sim.lcd.frames if rows[0].startswith(b"07:00:00")
+    )
+    assert shown_at < reads[-1]
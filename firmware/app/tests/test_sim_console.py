@@ -0,0 +1,36 @@
+from app import const
+
+
+def test_console_is_polled_rarely_until_connected(sim):
+    sim.boot(IDLE_TIMEOUT=const.HOUR)
+    sim.run(1)
+
+    start = sim.clock.wakeups
+    sim.run(const.MINUTE)
+    disconnected = sim.clock.wakeups - start
+
+    sim.serial.connected = True
+    sim.run(sim.core.console.IDLE_POLL_INTERVAL)
+
+    start = sim.clock.wakeups
+    sim.run(const.MINUTE)
+    connected = sim.clock.wakeups - start
+
+    assert connected - disconnected > 500
+
+
+def test_long_input_is_cut_off(sim, capsys):
+    sim.boot()
+    console = sim.core.console
+
+    sim.serial.write("x" * 1000)
+    sim.run(console.IDLE_POLL_INTERVAL)
+    assert len(console.line) == console.MAX_LINE_LENGTH
+
+    capsys.readouterr()
+    sim.serial.write("\nboot\n")
+    sim.run(1)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0] == "Unknown command: " + "x" * console.MAX_LINE_LENGTH
+    assert lines[-1] == "END"
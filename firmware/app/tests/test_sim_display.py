@@ -0,0 +1,35 @@
+import pytest
+
+
+def test_least_recently_used_characters_are_replaced(sim):
+    sim.boot()
+    display = sim.core.display
+    bitmaps = [(idx,) * 8 for idx in range(1, 12)]
+
+    display.clear()
+    slots = [display.get_slot(bitmap) for bitmap in bitmaps[:8]]
+    assert sorted(slots) == list(range(display.SLOT_COUNT))
+
+    # characters already stored are reused
+    display.clear()
+    assert [display.get_slot(bitmap) for bitmap in bitmaps[:6]] == slots[:6]
+
+    # the ones not used in the previous frame are replaced first
+    display.clear()
+    new_slots = {display.get_slot(bitmaps[8]), display.get_slot(bitmaps[9])}
+    assert new_slots == set(slots[6:])
+    assert display.get_slot(bitmaps[10]) in slots[:6]
+    assert display.get_slot(bitmaps[0]) in slots[:6]
+
+
+def test_too_many_characters_on_one_screen(sim):
+    sim.boot()
+    display = sim.core.display
+    bitmaps = [(idx,) * 8 for idx in range(1, 10)]
+
+    display.clear()
+    for col, bitmap in enumerate(bitmaps[:8]):
+        display.write_char((col, 0), bitmap)
+
+    with pytest.raises(ValueError):
+        display.write_char((8, 0), bitmaps[8])
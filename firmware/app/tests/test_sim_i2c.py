@@ -0,0 +1,56 @@
+import pytest
+
+from sim.simulator import EEPROM_ADDRESS, RTC_ADDRESS
+
+
+def test_transactions_are_counted_for_each_device(sim):
+    sim.boot()
+    sim.run(1)
+
+    stats = sim.core.i2c.stats
+    for address in (EEPROM_ADDRESS, RTC_ADDRESS):
+        count = stats[address][sim.core.i2c.STAT_COUNT]
+        assert count == sim.board.i2c_transactions[address]
+
+
+def test_errors_are_counted(sim):
+    sim.boot()
+    i2c = sim.core.i2c
+
+    i2c.try_lock()
+    try:
+        with pytest.raises(OSError):
+            i2c.writeto(0x10, b"\x00")
+    finally:
+        i2c.unlock()
+
+    assert i2c.stats[0x10] == [1, 0, 1, 0]
+
+
+def test_diagnostics_screen_is_hidden_in_main_menu(sim):
+    sim.boot()
+    sim.run(1)
+
+    sim.hold(sim.core.KEY_LEFT_PIN, 3.5)
+    sim.run(5)
+    sim.hold(sim.core.KEY_RIGHT_PIN, 6.0)
+    sim.run(7)
+
+    assert sim.lcd.text[0].startswith(f"{RTC_ADDRESS:02X} n")
+
+    sim.hold(sim.core.KEY_ENTER_PIN, 0.1)
+    sim.run(1)
+
+    assert sim.lcd.text[1].strip() == "Return"
+
+
+def test_console_prints_bus_counters(sim, capsys):
+    sim.boot()
+    sim.run(1)
+
+    capsys.readouterr()
+    sim.serial.write("i2c\n")
+    sim.run(sim.core.console.IDLE_POLL_INTERVAL)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines] == ["0x57", "0x68", "END"]
@@ -0,0 +1,50 @@
+from app import const
+from sim.clock import TICKS_OFFSET, TICKS_PERIOD
+
+
+def test_full_queue_is_written_synchronously(sim):
+    sim.boot()
+    sim.run(1)
+
+    logger = sim.core.logger
+    first = logger.address
+    count = logger.QUEUE_SIZE + 5
+    message_ids = [const.TASK_TIMEOUT + idx % 8 for idx in range(count)]
+
+    # no other task runs in the meantime, so the queue is not written by the loop
+    for message_id in message_ids:
+        logger.log(message_id)
+
+    assert sim.eeprom.data[first] == message_ids[0]
+    assert logger.queue_length < logger.QUEUE_SIZE
+
+    sim.run(1)
+
+    frames = [
+        sim.eeprom.data[address : address + logger.FRAME_SIZE]
+        for address in range(first, logger.address, logger.FRAME_SIZE)
+    ]
+    assert [frame[0] for frame in frames] == message_ids
+    assert [frame[4] for frame in frames] == [
+        (frames[0][4] + idx) % logger.SEQ_MODULO for idx in range(count)
+    ]
+
+
+def test_queue_is_written_across_ticks_wraparound(sim):
+    sim.boot()
+
+    # ticks_ms() wraps around about a minute after the start
+    wraparound = (TICKS_PERIOD - TICKS_OFFSET) / 1000
+    sim.run(wraparound - sim.clock.now - 0.003)
+
+    logger = sim.core.logger
+    first = logger.address
+    count = logger.QUEUE_SIZE * 2
+
+    for _ in range(count):
+        logger.log(const.RTC_SAVE)
+
+    sim.run(1)
+
+    assert logger.address == first + count * logger.FRAME_SIZE
+    assert sim.eeprom.data[logger.address - logger.FRAME_SIZE] == const.RTC_SAVE
@@ -0,0 +1,192 @@
+from app import const
+from app.types import SettingsT
+from sim.alloc import AllocationTracer
+
+
+def test_idle_screen_shows_time(sim):
+    sim.set_time(2024, 5, 6, 7, 59, 58)
+    sim.boot()
+    sim.run(3)
+
+    assert sim.lcd.text[0].startswith("08:00:01")
+
+
+def test_idle_screen_hides_seconds_while_sleeping(sim):
+    sim.set_time(2024, 5, 6, 7, 59, 58)
+    sim.boot(IDLE_TIMEOUT=10)
+    sim.run(75)
+
+    assert sim.lcd.text[0].startswith("08:01   ")
+
+
+def test_main_menu_is_entered_after_holding_left(sim):
+    sim.boot()
+    sim.run(1)
+
+    sim.hold(sim.core.KEY_LEFT_PIN, 3.5)
+    sim.run(5)
+
+    assert sim.lcd.text[1].strip() == "Preview"
+
+
+def test_main_menu_is_translated(sim):
+    sim.boot(LANG="pl")
+    sim.run(1)
+
+    sim.hold(sim.core.KEY_LEFT_PIN, 3.5)
+    sim.run(5)
+
+    assert sim.lcd.text[1].strip() == "Podglad"
+
+
+def test_quick_presses_are_not_lost(sim):
+    sim.boot()
+    sim.run(1)
+
+    sim.hold(sim.core.KEY_LEFT_PIN, 3.5)
+    sim.run(5)
+
+    for idx in range(3):
+        sim.hold(sim.core.KEY_RIGHT_PIN, 0.005, sim.clock.now + idx * 0.01)
+    sim.run(1)
+
+    assert sim.lcd.text[1].strip() == "Set opening"
+
+
+def test_event_log_survives_reboot(sim, read_log):
+    sim.boot()
+    sim.run(1)
+    sim.boot()
+    sim.run(1)
+
+    lines = read_log()
+    assert sum(line.endswith("Device start") for line in lines) == 2
+
+
+def test_idle_frames_are_drawn_without_allocations(sim):
+    sim.set_time(2024, 5, 6, 7, 59, 58)
+    sim.boot()
+    sim.run(1)
+
+    menu = sim.menu.renderer.menu
+    with AllocationTracer() as tracer:
+        for _ in range(5):
+            sim.clock.advance(1)
+            menu.render()
+
+    assert not tracer.allocations
+    assert sim.lcd.text[0].startswith("08:00:04")
+
+
+def test_menu_screens_are_drawn_without_allocations(sim):
+    sim.boot()
+    sim.run(1)
+
+    for menu in (
+        sim.menu.MainMenu(),
+        sim.menu.PreviewMenu(),
+        sim.menu.MotorMenu(sim.core.motor.ACT_OPEN),
+        sim.menu.SystemMenu(),
+    ):
+        menu.render()
+
+        with AllocationTracer() as tracer:
+            menu.render()
+
+        assert not tracer.allocations, type(menu).__name__
+
+
+def test_preview_shows_the_time_of_day(sim):
+    sim.set_time(2024, 5, 6, 7, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 15, 16, 0, 90, 2))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+    sim.run(1)
+
+    sim.menu.PreviewMenu().enter()
+    sim.run(1)
+
+    assert sim.lcd.text[0].startswith("     08:15:00(")
+    assert sim.lcd.text[1].startswith(" 01  16:00:00(")
+
+
+def test_history_is_browsed_from_the_selected_day(sim):
+    sim.set_time(2024, 5, 6, 22, 0, 0)
+    sim.boot()
+    sim.run(4 * const.HOUR)
+    sim.core.logger.log(const.RTC_SAVE)
+    sim.run(1)
+
+    core = sim.core
+    sim.hold(core.KEY_LEFT_PIN, 3.5)
+    sim.run(5)
+
+    for _ in range(sim.menu.MainMenu.ID_HISTORY):
+        sim.hold(core.KEY_RIGHT_PIN, 0.1)
+        sim.run(1)
+
+    sim.hold(core.KEY_ENTER_PIN, 0.1)
+    sim.run(1)
+    assert sim.lcd.text[0].strip() == "Clock updated"
+    assert sim.lcd.text[1].startswith("\x7f99 ")
+
+    # holding the button switches to the date mode
+    sim.hold(core.KEY_ENTER_PIN, 1.5)
+    sim.run(2)
+    assert sim.lcd.text[1].startswith("\x7f05-07~")
+
+    sim.hold(core.KEY_LEFT_PIN, 0.1)
+    sim.run(1)
+    assert sim.lcd.text[1].startswith("\x7f05-06~")
+
+    sim.hold(core.KEY_ENTER_PIN, 0.1)
+    sim.run(1)
+
+    lines = []
+    for _ in range(4):
+        lines.append(sim.lcd.text[0].strip())
+        sim.hold(core.KEY_RIGHT_PIN, 0.1)
+        sim.run(1)
+
+    assert lines == [
+        "Factory settings",
+        "Device start",
+        "Scheduler start",
+        "Clock updated",
+    ]
+
+    sim.hold(core.KEY_ENTER_PIN, 0.1)
+    sim.run(1)
+    assert sim.lcd.text[1].strip() == "History"
+
+
+def test_manual_open_does_not_block_other_tasks(sim, read_log):
+    sim.boot()
+    sim.run(1)
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, 40, 2))
+    sim.run(1)
+
+    sim.hold(core.KEY_LEFT_PIN, 3.5)
+    sim.run(5)
+
+    for _ in range(sim.menu.MainMenu.ID_OPEN):
+        sim.hold(core.KEY_RIGHT_PIN, 0.1)
+        sim.run(1)
+
+    sim.hold(core.KEY_ENTER_PIN, 0.1)
+    sim.run(5)
+
+    # the console and the logger keep running while the motor is working
+    lines = read_log()
+    assert lines[-1].endswith("Opening (1)")
+    assert core.motor.lock
+
+    sim.run(20)
+
+    lines = read_log()
+    assert lines[-1].endswith("Opened")
+    assert not core.motor.lock
@@ -0,0 +1,55 @@
+def test_profiler_is_disabled_by_default(sim):
+    sim.boot()
+    sim.run(1)
+
+    sim.hold(sim.core.KEY_RIGHT_PIN, 0.1)
+    sim.run(1)
+
+    assert not any(sim.core.profiler.totals)
+
+
+def test_profiler_ring_buffer_keeps_recent_samples(sim):
+    sim.boot()
+    profiler = sim.core.profiler
+    profiler.set_enabled(True)
+
+    for idx in range(profiler.SAMPLE_COUNT + 10):
+        profiler.begin(profiler.LOGGER, sim.clock.ticks_ms() - idx)
+        profiler.end(profiler.LOGGER)
+
+    assert profiler.totals[profiler.LOGGER] == profiler.SAMPLE_COUNT + 10
+    assert profiler.get_summary(profiler.LOGGER) == (10, 73.5, 136, 137)
+
+
+def test_console_prints_profiler_report(sim, capsys):
+    sim.boot()
+    sim.run(1)
+
+    sim.serial.write("profile on\n")
+    sim.run(sim.core.console.IDLE_POLL_INTERVAL)
+
+    sim.hold(sim.core.KEY_LEFT_PIN, 3.5)
+    sim.run(5)
+
+    capsys.readouterr()
+    sim.serial.write("profile\n")
+    sim.run(sim.core.console.IDLE_POLL_INTERVAL)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[0] for line in lines] == [
+        "menu",
+        "scheduler",
+        "display",
+        "latency",
+        "END",
+    ]
+
+
+def test_settings_scrubber_is_profiled(sim):
+    sim.boot(SCRUB_INTERVAL=10)
+    profiler = sim.core.profiler
+    profiler.set_enabled(True)
+
+    sim.run(25)
+
+    assert profiler.totals[profiler.SCRUB] == 2
@@ -0,0 +1,127 @@
+import pytest
+
+from app import const
+from app.types import SettingsT
+from sim.alloc import AllocationTracer
+
+
+def test_scheduler_runs_operations_for_a_whole_day(sim):
+    sim.set_time(2024, 5, 6, 7, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, 90, 9))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+
+    sim.run(const.DAY)
+
+    pulses = sim.get_pulses(sim.get_pin("GP19"))
+    assert len(pulses) == 9
+
+    for idx, (start, end) in enumerate(pulses):
+        assert start == pytest.approx((idx + 1) * const.HOUR, abs=1.0)
+        assert end - start == pytest.approx(10.0, abs=0.01)
+
+    assert not sim.get_pulses(sim.get_pin("GP21"))
+
+
+def test_scheduler_keeps_other_action_after_restart(sim):
+    sim.set_time(2024, 5, 6, 7, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, 90, 9))
+    core.settings.save(core.motor.ACT_CLOSE, SettingsT(9, 0, 17, 0, 30, 3))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+    core.scheduler.restart(core.motor.ACT_CLOSE)
+
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 30, 8, 30, 10, 1))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+
+    tasks = core.scheduler.get_tasks()
+    assert [action_id for action_id, _ in tasks].count(core.motor.ACT_CLOSE) == 3
+    assert len(tasks) == 4
+    assert tasks == sorted(tasks, key=lambda task: task[1])
+
+
+def test_scheduler_reloads_settings_after_full_restart(sim):
+    sim.set_time(2024, 5, 6, 7, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, 90, 9))
+    core.settings.save(core.motor.ACT_CLOSE, SettingsT(9, 0, 17, 0, 30, 3))
+    core.scheduler.restart()
+
+    assert core.scheduler.count == 12
+
+    sim.run(const.DAY)
+
+    assert len(sim.get_pulses(sim.get_pin("GP19"))) == 9
+    assert len(sim.get_pulses(sim.get_pin("GP21"))) == 3
+
+
+def test_scheduler_is_disabled_if_rtc_lost_power(sim):
+    sim.rtc.lost_power = True
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, 90, 9))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+
+    sim.run(const.DAY)
+
+    assert not sim.get_pulses(sim.get_pin("GP19"))
+
+
+def test_watchdog_is_fed_while_sleeping(sim):
+    sim.board.set_level(sim.get_pin("GP28"), True)
+    sim.set_time(2024, 5, 6, 7, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_CLOSE, SettingsT(20, 0, 20, 0, 30, 1))
+    core.scheduler.restart(core.motor.ACT_CLOSE)
+
+    sim.run(const.DAY)
+
+    assert core.wdt.enabled
+    assert sim.watchdog.max_gap <= core.wdt.TIMEOUT / 2 + 0.5
+    assert len(sim.get_pulses(sim.get_pin("GP21"))) == 1
+
+
+def test_scheduler_runs_operations_after_2038(sim):
+    sim.set_time(2040, 5, 6, 7, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, 90, 9))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+
+    sim.run(const.DAY)
+
+    assert len(sim.get_pulses(sim.get_pin("GP19"))) == 9
+
+
+def test_scheduler_runs_jobs_without_allocations(sim):
+    sim.set_time(2024, 5, 6, 7, 59, 0)
+    sim.boot(CLOCK_SYNC_INTERVAL=const.DAY)
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, 90, 9))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+    sim.run(1)
+
+    # motor and logger are not checked here, so the jobs are replaced
+    jobs = []
+
+    async def job(reason_id: int, duration: float) -> None:
+        jobs.append((reason_id, duration))
+
+    core.scheduler.functions = (job, job)
+
+    with AllocationTracer(core.scheduler.loop, core.scheduler.run) as tracer:
+        sim.run(2 * const.HOUR)
+
+    assert jobs == [(core.motor.REASON_AUTO, 10.0)] * 2
+    assert not tracer.allocations
@@ -0,0 +1,86 @@
+from app import const
+from app.types import SettingsT
+from sim.simulator import EEPROM_ADDRESS
+
+
+def test_settings_are_loaded_without_reading_eeprom(sim):
+    sim.boot()
+    sim.run(1)
+
+    core = sim.core
+    obj = SettingsT(8, 0, 16, 0, 90, 9)
+    core.settings.save(core.motor.ACT_OPEN, obj)
+    sim.run(1)
+
+    transactions = sim.board.i2c_transactions[EEPROM_ADDRESS]
+    assert core.settings.load(core.motor.ACT_OPEN) == obj
+    assert core.settings.load(core.motor.ACT_CLOSE) == core.settings.DEFAULTS
+    assert sim.board.i2c_transactions[EEPROM_ADDRESS] == transactions
+
+    sim.boot()
+    assert sim.core.settings.load(core.motor.ACT_OPEN) == obj
+
+
+def test_corrupted_settings_are_repaired(sim, read_log):
+    sim.boot()
+    sim.run(1)
+
+    core = sim.core
+    obj = SettingsT(8, 0, 16, 0, 90, 9)
+    core.settings.save(core.motor.ACT_OPEN, obj)
+    sim.run(1)
+
+    address = core.motor.ACT_OPEN + core.settings.RECORD_SIZE
+    record = sim.eeprom.data[address : address + core.settings.RECORD_SIZE]
+    sim.eeprom.data[address + 4] ^= 0xFF
+
+    sim.run(const.SCRUB_INTERVAL * 2)
+
+    assert sim.eeprom.data[address : address + core.settings.RECORD_SIZE] == record
+    assert core.settings.load(core.motor.ACT_OPEN) == obj
+
+    lines = read_log()
+    assert sum(line.endswith("Settings fixed") for line in lines) == 1
+    assert not any(line.endswith("Settings error") for line in lines)
+
+    sim.boot()
+    assert sim.core.settings.load(core.motor.ACT_OPEN) == obj
+
+
+def test_settings_journal_wraps_around(sim):
+    sim.boot()
+    sim.run(1)
+
+    core = sim.core
+    count = core.settings.SLOT_COUNT + 5
+
+    for idx in range(count):
+        core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, idx, 1))
+        sim.run(1)
+
+    assert core.settings.heads[core.motor.ACT_OPEN][0] == 6
+
+    sim.boot()
+    obj = sim.core.settings.load(core.motor.ACT_OPEN)
+    assert obj == SettingsT(8, 0, 16, 0, count - 1, 1)
+
+
+def test_torn_settings_record_is_ignored(sim):
+    sim.boot()
+    sim.run(1)
+
+    core = sim.core
+    count = core.settings.SLOT_COUNT + 5
+
+    for idx in range(count):
+        core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 16, 0, idx, 1))
+        sim.run(1)
+
+    # power was lost in the middle of the last write
+    slot = core.settings.get_last(core.motor.ACT_OPEN)[0]
+    address = core.motor.ACT_OPEN + slot * core.settings.RECORD_SIZE
+    sim.eeprom.data[address + 8 : address + core.settings.RECORD_SIZE] = bytes(8)
+
+    sim.boot()
+    obj = sim.core.settings.load(core.motor.ACT_OPEN)
+    assert obj == SettingsT(8, 0, 16, 0, count - 2, 1)
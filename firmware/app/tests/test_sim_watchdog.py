@@ -0,0 +1,76 @@
+import asyncio
+import time
+
+import pytest
+
+from app import const
+from app.types import SettingsT
+from sim.hardware import WatchDogTimeout
+
+
+def enable_watchdog(sim):
+    sim.board.set_level(sim.get_pin("GP28"), True)
+
+
+def test_watchdog_is_fed_while_tasks_are_alive(sim):
+    enable_watchdog(sim)
+    sim.set_time(2024, 5, 6, 5, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(6, 0, 17, 0, 200, 20))
+    core.settings.save(core.motor.ACT_CLOSE, SettingsT(6, 15, 17, 15, 200, 20))
+    core.scheduler.restart()
+
+    sim.run(const.HOUR * 14)
+
+    # jobs were running, with the scheduler and the motor checking in
+    assert len(sim.get_pulses(sim.get_pin("GP19"))) == 20
+    assert len(sim.get_pulses(sim.get_pin("GP21"))) == 20
+
+    assert core.wdt.enabled
+    assert not core.wdt.expired
+    assert core.wdt.worst_lag < core.wdt.LAG_THRESHOLD
+    assert sim.watchdog.max_gap < core.wdt.TIMEOUT
+
+
+def test_hung_task_is_logged_before_reset(sim, read_log):
+    enable_watchdog(sim)
+    sim.boot()
+    sim.run(1)
+
+    async def hang(timeout=None):
+        _ = timeout
+        await asyncio.Future()
+
+    sim.core.keys.get = hang
+
+    with pytest.raises(WatchDogTimeout):
+        sim.run(const.MINUTE)
+
+    sim.boot()
+    lines = read_log()
+    line = next(line for line in lines if "Hang: menu" in line)
+    assert int(line.split("(")[1].split()[0]) > sim.core.wdt.BUDGET
+
+
+def test_event_loop_lag_is_logged(sim, read_log):
+    sim.boot()
+    sim.run(1)
+
+    flush = sim.core.display.flush
+
+    def slow_flush():
+        time.sleep(1.5)
+        flush()
+
+    sim.core.display.flush = slow_flush
+    sim.hold(sim.core.KEY_RIGHT_PIN, 0.1)
+    sim.run(2)
+    sim.core.display.flush = flush
+
+    assert sim.core.wdt.worst_lag >= 1500
+
+    # lag is rounded down to tenths of a second
+    lines = read_log()
+    assert any("Delay: " in line and "(1500 ms)" in line for line in lines)
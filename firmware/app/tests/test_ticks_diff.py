@@ -0,0 +1,27 @@
+import pytest
+
+from sim.clock import TICKS_PERIOD, ticks_add, ticks_diff
+
+
+def test_ticks_diff():
+    assert ticks_diff(1500, 1000) == 500
+    assert ticks_diff(1000, 1500) == -500
+
+
+def test_ticks_diff_wraparound():
+    assert ticks_diff(100, TICKS_PERIOD - 100) == 200
+    assert ticks_diff(TICKS_PERIOD - 100, 100) == -200
+
+
+def test_ticks_diff_unwrapped_value():
+    assert ticks_diff(TICKS_PERIOD + 50, TICKS_PERIOD - 50) == 100
+
+
+def test_ticks_add_wraparound():
+    assert ticks_add(TICKS_PERIOD - 100, 200) == 100
+    assert ticks_add(100, -200) == TICKS_PERIOD - 100
+
+
+def test_ticks_add_overflow():
+    with pytest.raises(OverflowError):
+        ticks_add(0, TICKS_PERIOD // 2)
@@ -0,0 +1,14 @@
+from translations import TRANSLATIONS, compile_texts, get_path
+
+
+def test_compiled_texts_are_up_to_date():
+    for lang, texts in TRANSLATIONS.items():
+        with open(get_path(lang), "rb") as f:
+            assert f.read() == compile_texts(texts), lang
+
+
+def test_every_language_has_the_same_texts():
+    text_ids = set(TRANSLATIONS["en"])
+
+    for texts in TRANSLATIONS.values():
+        assert set(texts) == text_ids
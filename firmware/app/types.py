@@ -6,11 +6,7 @@ _SettingsT = namedtuple(
 )
 HistoryT = namedtuple(
     "HistoryT",
-    ("id", "hour", "minute", "second"),
-)
-TaskT = namedtuple(
-    "TaskT",
-    ("action_id", "timestamp", "function"),
+    ("id", "hour", "minute", "second", "day"),
 )
 
 
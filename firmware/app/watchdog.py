@@ -0,0 +1,161 @@
+import asyncio
+import board
+import supervisor
+from array import array
+from digitalio import DigitalInOut, Direction, Pull
+from microcontroller import watchdog
+from watchdog import WatchDogMode
+
+from adafruit_ticks import ticks_add, ticks_diff
+
+from app import const
+from app.boot import boot
+from app.shared import log
+
+WDT_PIN = board.GP28
+
+
+class _WatchDog:  # pylint:disable=too-many-instance-attributes
+    TIMEOUT = 8.0
+
+    SCHEDULER = 0
+    MENU = 1
+    LOGGER = 2
+    MOTOR = 3
+
+    TASK_NAMES = ("scheduler", "menu", "logger", "motor")
+
+    # maximum time between heartbeats of a monitored task, and the event loop lag
+    # which is logged, in milliseconds; the scheduler sleeps for up to TIMEOUT / 2,
+    # and the light sleep can start just before it is due
+    BUDGET = 10000
+    LAG_THRESHOLD = 1000
+
+    NO_HEARTBEAT = -1
+
+    def __init__(self) -> None:
+        self.wdt_pin = DigitalInOut(WDT_PIN)
+        self.wdt_pin.direction = Direction.INPUT
+        self.wdt_pin.pull = Pull.DOWN
+        self.enabled = False
+
+        self.heartbeats = array("l", [self.NO_HEARTBEAT] * len(self.TASK_NAMES))
+        self.expired = False
+
+        self.worst_lag = 0
+        self.worst_task = None
+
+        # logger is using the watchdog, so it is assigned after both are created
+        self.logger = None
+
+        self._current_task = None
+        self._blocked_timestamp = supervisor.ticks_ms()
+
+    def feed(self) -> None:
+        # for code which blocks the event loop on purpose, so the monitored tasks
+        # cannot check in until it is finished
+        now = supervisor.ticks_ms()
+        self._blocked_timestamp = now
+
+        if not self.check(now):
+            return
+
+        for task in range(len(self.TASK_NAMES)):
+            if self.heartbeats[task] != self.NO_HEARTBEAT:
+                self.heartbeats[task] = now
+
+        self._feed()
+
+    def resume(self, task: int) -> None:
+        # after the light sleep, other tasks are resumed as soon as possible,
+        # so the time spent sleeping is counted, except for the event loop lag
+        self._blocked_timestamp = supervisor.ticks_ms()
+        self.check_in(task)
+
+    def start(self, task: int) -> None:
+        self.heartbeats[task] = supervisor.ticks_ms()
+
+    def stop(self, task: int) -> None:
+        self.heartbeats[task] = self.NO_HEARTBEAT
+
+    def check_in(self, task: int) -> None:
+        # hardware watchdog is fed only if every monitored task is alive
+        now = supervisor.ticks_ms()
+        self.heartbeats[task] = now
+
+        if self.check(now):
+            self._feed()
+
+    def check(self, now: int) -> bool:
+        # tasks are only monitored while the watchdog is running, otherwise
+        # the device can sleep for longer than the budget
+        if not self.enabled:
+            return True
+        if self.expired:
+            return False
+
+        for task in range(len(self.TASK_NAMES)):
+            heartbeat = self.heartbeats[task]
+            if heartbeat == self.NO_HEARTBEAT:
+                continue
+
+            gap = ticks_diff(now, heartbeat)
+            if gap > self.BUDGET:
+                self._expire(task, gap)
+                return False
+
+        return True
+
+    async def sleep(self, task: int, delay: float) -> None:
+        due = ticks_add(supervisor.ticks_ms(), int(delay * 1000))
+        await asyncio.sleep(delay)
+
+        # lag caused by the code blocking the event loop on purpose is not counted
+        now = supervisor.ticks_ms()
+        if ticks_diff(self._blocked_timestamp, due) > 0:
+            due = self._blocked_timestamp
+
+        # the task which was resumed before is most likely the one which was late
+        # to return control to the event loop; tasks which do not use this method,
+        # such as the renderer and the console, are not seen here
+        lag = ticks_diff(now, due)
+        if lag > self.worst_lag and self._current_task is not None:
+            self._record_lag(lag, self._current_task)
+
+        self._current_task = task
+        self.check_in(task)
+
+    def _record_lag(self, lag: int, task: int) -> None:
+        self.worst_lag = lag
+        self.worst_task = task
+
+        if lag > self.LAG_THRESHOLD:
+            log(f"Event loop lag {lag} ms after {self.TASK_NAMES[task]}")
+            self.logger.log(const.LOOP_LAG + task, lag)
+
+    def _expire(self, task: int, gap: int) -> None:
+        # the device is going to be restarted, so the log is written immediately
+        self.expired = True
+
+        log(f"No heartbeat from {self.TASK_NAMES[task]} for {gap} ms")
+        self.logger.log(const.TASK_TIMEOUT + task, gap)
+        self.logger.flush()
+
+    def _feed(self) -> None:
+        # watchdog will be enabled as soon as wdt_pin is detected to be HIGH,
+        # and it cannot be disabled until restart
+
+        if not self.enabled and self.wdt_pin.value is True:
+            watchdog.timeout = self.TIMEOUT
+            watchdog.mode = WatchDogMode.RESET
+            self.enabled = True
+
+            log("Watchdog initialized")
+
+        if self.enabled:
+            watchdog.feed()
+
+
+wdt = _WatchDog()
+wdt.feed()
+boot.stage("watchdog")
@@ -1,4 +1,4 @@
 #!/usr/bin/env bash
 
-FILES="app boot.py code.py safemode.py"
+FILES="app sim boot.py code.py safemode.py"
 black $FILES && isort $FILES && pylint $FILES && pytest
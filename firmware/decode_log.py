@@ -0,0 +1,49 @@
+import sys
+
+from app import const
+from app.shared import get_date, get_log_duration, verify_checksum
+from translations import TRANSLATIONS
+
+# event log is printed by the device as raw frames, this script decodes them,
+# e.g. python decode_log.py pl < log.txt
+
+
+def decode_frame(line: str, texts: dict[int, str]) -> str | None:
+    # None for the frames marked as invalid, and for any other lines
+    values = line.split()
+    if len(values) != const.LOG_FRAME_SIZE:
+        return None
+
+    try:
+        frame = [int(value, 16) for value in values]
+    except ValueError:
+        return None
+
+    if not verify_checksum(frame):
+        return None
+
+    day = frame[5] + frame[6] * 256
+    if day == const.LOG_DAY_UNKNOWN:
+        date = "????-??-??"
+    else:
+        year, month, mday = get_date(day)
+        date = f"{year:04}-{month:02}-{mday:02}"
+
+    hms = f"{frame[1] & 0x1F:02}:{frame[2] & 0x3F:02}:{frame[3] & 0x3F:02}"
+    text = f"{date} {hms} {frame[0]:3} {texts.get(frame[0], f'{frame[0]}?')}"
+
+    duration = get_log_duration(frame)
+    return f"{text} ({duration} ms)" if duration else text
+
+
+def main() -> None:
+    texts = TRANSLATIONS[sys.argv[1] if len(sys.argv) > 1 else "en"]
+
+    for line in sys.stdin:
+        text = decode_frame(line, texts)
+        if text is not None:
+            print(text)
+
+
+if __name__ == "__main__":
+    main()
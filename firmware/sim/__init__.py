@@ -0,0 +1,3 @@
+from sim.simulator import Simulator
+
+__all__ = ["Simulator"]
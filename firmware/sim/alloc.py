@@ -0,0 +1,132 @@
+import dis
+import os
+import sys
+
+APP_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "app")
+TESTS_DIR = os.path.join(APP_DIR, "tests")
+
+# operations which create a new object on the heap in MicroPython as well;
+# small integers are not allocated there, and loops over range() are optimized
+ALLOCATING_OPCODES = {
+    "BUILD_CONST_KEY_MAP",
+    "BUILD_LIST",
+    "BUILD_MAP",
+    "BUILD_SET",
+    "BUILD_SLICE",
+    "BUILD_STRING",
+    "BUILD_TUPLE",
+    "FORMAT_VALUE",
+    "MAKE_FUNCTION",
+}
+ALLOCATING_TYPES = {
+    "bytearray",
+    "bytes",
+    "dict",
+    "enumerate",
+    "float",
+    "list",
+    "memoryview",
+    "set",
+    "sorted",
+    "str",
+    "tuple",
+    "zip",
+}
+NON_ALLOCATING_BUILTINS = {"abs", "index", "isinstance", "len", "max", "min"}
+
+# larger integers do not fit in a pointer and are allocated on the heap,
+# e.g. Unix timestamps
+SMALL_INT_MIN = -(1 << 30)
+SMALL_INT_MAX = (1 << 30) - 1
+
+
+class AllocationTracer:
+    # approximates the allocations made by the firmware code, as the memory
+    # used by the interpreter on the PC does not correspond to the device
+
+    def __init__(self, *functions) -> None:
+        # only the given functions and the functions called by them are traced,
+        # or the whole app code if none are given
+        self.allocations = []
+        self._codes = {getattr(fn, "__func__", fn).__code__ for fn in functions}
+        self._instructions = {}
+
+    def __enter__(self) -> "AllocationTracer":
+        sys.setprofile(self._profile)
+        sys.settrace(self._trace)
+        return self
+
+    def __exit__(self, *_) -> None:
+        sys.settrace(None)
+        sys.setprofile(None)
+
+    def _record(self, frame, name: str) -> None:
+        filename = os.path.basename(frame.f_code.co_filename)
+        self.allocations.append(f"{filename}:{frame.f_lineno} {name}")
+
+    def _is_traced(self, frame) -> bool:
+        if not is_app_code(frame.f_code):
+            return False
+        if not self._codes:
+            return True
+
+        while frame is not None:
+            if frame.f_code in self._codes:
+                return True
+            frame = frame.f_back
+
+        return False
+
+    def _profile(self, frame, event: str, arg) -> None:
+        if event != "c_call" or not self._is_traced(frame):
+            return
+
+        if arg.__name__ not in NON_ALLOCATING_BUILTINS:
+            self._record(frame, f"{arg.__name__}()")
+
+    def _trace(self, frame, event: str, _arg):
+        if event != "call" or not self._is_traced(frame):
+            return None
+
+        frame.f_trace_opcodes = True
+        return self._trace_opcode
+
+    def _trace_opcode(self, frame, event: str, _arg):
+        if event == "line":
+            self._check_locals(frame)
+        if event != "opcode":
+            return self._trace_opcode
+
+        instruction = self._get_instructions(frame.f_code).get(frame.f_lasti)
+        if instruction is None:
+            return self._trace_opcode
+
+        if instruction.opname in ALLOCATING_OPCODES:
+            self._record(frame, instruction.opname)
+        elif (
+            instruction.opname == "LOAD_GLOBAL"
+            and instruction.argval in ALLOCATING_TYPES
+        ):
+            self._record(frame, f"{instruction.argval}()")
+
+        return self._trace_opcode
+
+    def _check_locals(self, frame) -> None:
+        # values are checked after they are assigned by the previous line
+        for name, value in frame.f_locals.items():
+            if isinstance(value, int) and not SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+                self._record(frame, f"{name} int")
+
+    def _get_instructions(self, code) -> dict:
+        if code not in self._instructions:
+            self._instructions[code] = {
+                instruction.offset: instruction
+                for instruction in dis.get_instructions(code)
+            }
+
+        return self._instructions[code]
+
+
+def is_app_code(code) -> bool:
+    filename = code.co_filename
+    return filename.startswith(APP_DIR) and not filename.startswith(TESTS_DIR)
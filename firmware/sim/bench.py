@@ -0,0 +1,226 @@
+import json
+import os
+import sys
+import tracemalloc
+
+import pytest
+
+from app import const
+from app.types import SettingsT
+from sim.simulator import EEPROM_ADDRESS, RTC_ADDRESS, Simulator
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# metrics which depend on the Python version, regressions are only reported
+# if they are larger than the tolerance
+UNSTABLE_METRICS = {"alloc_peak_bytes": 0.25}
+
+
+def tap(sim: Simulator, pin, count: int = 1, duration: float = 0.1) -> None:
+    for _ in range(count):
+        sim.hold(pin, duration)
+        sim.run(duration + 0.25)
+
+
+def hold(sim: Simulator, pin, duration: float) -> None:
+    sim.hold(pin, duration)
+    sim.run(duration + 0.25)
+
+
+def enter_main_menu(sim: Simulator, position: int) -> None:
+    hold(sim, sim.core.KEY_LEFT_PIN, 3.5)
+    tap(sim, sim.core.KEY_RIGHT_PIN, position)
+    tap(sim, sim.core.KEY_ENTER_PIN)
+
+
+def run_idle_day(sim: Simulator):
+    sim.set_time(2024, 5, 6, 0, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(8, 0, 8, 0, 30, 1))
+    core.settings.save(core.motor.ACT_CLOSE, SettingsT(20, 0, 20, 0, 30, 1))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+    core.scheduler.restart(core.motor.ACT_CLOSE)
+    sim.run(const.MINUTE)
+
+    yield
+    sim.run(const.DAY)
+
+
+def run_motor_menu(sim: Simulator):
+    sim.set_time(2024, 5, 6, 12, 0, 0)
+    sim.boot()
+    sim.run(const.MINUTE)
+
+    yield
+    left, right, enter = sim.core.KEY_PINS
+    enter_main_menu(sim, 3)
+
+    # first hour
+    tap(sim, enter)
+    tap(sim, right, 8)
+    tap(sim, enter)
+
+    # last hour, using the hold acceleration
+    tap(sim, right, 2)
+    tap(sim, enter)
+    hold(sim, right, 2.5)
+    tap(sim, left, 2)
+    tap(sim, enter)
+
+    # duration
+    tap(sim, right, 2)
+    tap(sim, enter)
+    hold(sim, right, 4.0)
+    tap(sim, enter)
+
+    # number of operations
+    tap(sim, right)
+    tap(sim, enter)
+    tap(sim, right, 4)
+    tap(sim, enter)
+
+    # save
+    tap(sim, right, 2)
+    tap(sim, enter)
+    sim.run(const.MINUTE)
+
+
+def run_history_menu(sim: Simulator):
+    sim.set_time(2024, 5, 6, 12, 0, 0)
+    sim.boot()
+
+    for idx in range(sim.core.logger.FRAME_COUNT):
+        sim.core.logger.log(const.ACT_OPEN_START_AUTO + idx % 2 * 4)
+        sim.run(const.HOUR)
+
+    yield
+    left, _, enter = sim.core.KEY_PINS
+    enter_main_menu(sim, 6)
+
+    tap(sim, left, sim.menu.HistoryMenu.MAX_VALUE)
+
+    # jump back a few days in the date mode
+    hold(sim, enter, sim.menu.HistoryMenu.DATE_MODE_HOLD + 0.5)
+    tap(sim, left, 3)
+    tap(sim, enter)
+    sim.run(const.MINUTE)
+
+
+def run_dense_schedule(sim: Simulator):
+    sim.set_time(2024, 5, 6, 0, 0, 0)
+    sim.boot()
+
+    core = sim.core
+    core.settings.save(core.motor.ACT_OPEN, SettingsT(6, 0, 17, 0, 200, 20))
+    core.settings.save(core.motor.ACT_CLOSE, SettingsT(6, 15, 17, 15, 200, 20))
+    core.scheduler.restart(core.motor.ACT_OPEN)
+    core.scheduler.restart(core.motor.ACT_CLOSE)
+    sim.run(const.MINUTE)
+
+    yield
+    sim.run(const.DAY)
+
+
+WORKLOADS = {
+    "idle_day": run_idle_day,
+    "motor_menu": run_motor_menu,
+    "history_menu": run_history_menu,
+    "dense_schedule": run_dense_schedule,
+}
+
+
+def get_counters(sim: Simulator) -> dict[str, int]:
+    transactions = sim.board.i2c_transactions
+
+    return {
+        "i2c_eeprom": transactions.get(EEPROM_ADDRESS, 0),
+        "i2c_rtc": transactions.get(RTC_ADDRESS, 0),
+        "eeprom_bytes_written": sim.eeprom.bytes_written,
+        "eeprom_write_cycles": sim.eeprom.write_cycles,
+        "lcd_commands": sim.lcd.commands,
+        "lcd_bytes": sim.lcd.data_bytes,
+        "wakeups": sim.clock.wakeups,
+    }
+
+
+def measure(sim: Simulator, name: str, trace: bool = False) -> dict[str, int]:
+    workload = WORKLOADS[name](sim)
+
+    # set up the device first, it is not measured
+    next(workload)
+    before = get_counters(sim)
+
+    if trace:
+        tracemalloc.start()
+        base = tracemalloc.get_traced_memory()[0]
+
+    try:
+        for _ in workload:
+            pass
+    finally:
+        if trace:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    after = get_counters(sim)
+    result = {key: value - before[key] for key, value in after.items()}
+
+    if trace:
+        result["alloc_peak_bytes"] = peak - base
+
+    return result
+
+
+def get_regressions(results: dict, baseline: dict) -> list[str]:
+    regressions = []
+
+    for name, metrics in results.items():
+        for key, value in metrics.items():
+            expected = baseline.get(name, {}).get(key)
+            if expected is None:
+                continue
+
+            if value > expected * (1 + UNSTABLE_METRICS.get(key, 0)):
+                regressions.append(f"{name}.{key}: {value} > {expected}")
+
+    return regressions
+
+
+def load_baseline() -> dict:
+    with open(BASELINE_PATH, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> int:
+    results = {}
+
+    for name in WORKLOADS:
+        with pytest.MonkeyPatch.context() as monkeypatch:
+            sim = Simulator(monkeypatch)
+
+            try:
+                results[name] = measure(sim, name, trace=True)
+            finally:
+                sim.close()
+
+        print(name)
+        for key, value in results[name].items():
+            print(f"  {key:22} {value:10}")
+
+    if "--update" in sys.argv:
+        with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        return 0
+
+    regressions = get_regressions(results, load_baseline())
+    for regression in regressions:
+        print(f"Regression: {regression}")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+import asyncio
+import heapq
+import selectors
+
+# supervisor.ticks_ms() starts shortly before the wraparound on real devices
+TICKS_PERIOD = 1 << 29
+TICKS_OFFSET = TICKS_PERIOD - 65536
+
+
+# same as in the adafruit_ticks library
+def ticks_add(ticks: int, delta: int) -> int:
+    if not -TICKS_PERIOD // 2 < delta < TICKS_PERIOD // 2:
+        raise OverflowError("ticks interval overflow")
+
+    return (ticks + delta) % TICKS_PERIOD
+
+
+def ticks_diff(ticks_a: int, ticks_b: int) -> int:
+    # signed difference, valid if timestamps are less than half of the period apart
+    diff = (ticks_a - ticks_b) % TICKS_PERIOD
+    if diff >= TICKS_PERIOD // 2:
+        diff -= TICKS_PERIOD
+    return diff
+
+
+class VirtualClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.callbacks = []
+
+        # number of times the device was waiting for anything, or sleeping
+        self.wakeups = 0
+
+    def advance(self, seconds: float) -> None:
+        self.now += max(seconds, 0)
+
+        for callback in self.callbacks:
+            callback()
+
+    def monotonic(self) -> float:
+        return self.now
+
+    def monotonic_ns(self) -> int:
+        return round(self.now * 1_000_000_000)
+
+    def ticks_ms(self) -> int:
+        return (round(self.now * 1000) + TICKS_OFFSET) % TICKS_PERIOD
+
+    def sleep(self, seconds: float) -> None:
+        self.advance(seconds)
+
+
+class VirtualSelector(selectors.BaseSelector):
+    # nothing is ever ready to be read, the time passes instead of waiting for I/O
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.keys = {}
+
+    def register(self, fileobj, events, data=None) -> selectors.SelectorKey:
+        key = selectors.SelectorKey(fileobj, id(fileobj), events, data)
+        self.keys[fileobj] = key
+        return key
+
+    def unregister(self, fileobj) -> selectors.SelectorKey:
+        return self.keys.pop(fileobj)
+
+    def select(self, timeout=None) -> list:
+        if timeout is None:
+            raise RuntimeError("Event loop would wait forever")
+
+        if timeout > 0:
+            self.clock.wakeups += 1
+
+        self.clock.advance(timeout)
+        return []
+
+    def get_map(self) -> dict:
+        return self.keys
+
+    def close(self) -> None:
+        self.keys = {}
+
+
+class VirtualEventLoop(asyncio.SelectorEventLoop):
+    def __init__(self, clock: VirtualClock) -> None:
+        super().__init__(VirtualSelector(clock))
+        self.clock = clock
+
+    def time(self) -> float:
+        return self.clock.monotonic()
+
+    def _run_once(self) -> None:
+        # timers which are due are run before the tasks which yielded with sleep(0),
+        # like in MicroPython; CPython would run them in the next iteration
+        end_time = self.time() + self._clock_resolution
+        due = []
+
+        while self._scheduled and self._scheduled[0].when() < end_time:
+            handle = heapq.heappop(self._scheduled)
+            handle._scheduled = False  # pylint:disable=protected-access
+
+            if handle.cancelled():
+                self._timer_cancelled_count -= 1  # pylint:disable=no-member
+            else:
+                due.append(handle)
+
+        if not due:
+            super()._run_once()
+            return
+
+        # sleeping tasks are woken up by the callbacks, and these are run
+        # in the next iteration, still before the tasks which yielded
+        yielded = list(self._ready)
+        self._ready.clear()
+        self._ready.extend(due)
+
+        super()._run_once()
+        self._ready.extend(yielded)
@@ -0,0 +1,704 @@
+import sys
+import time
+
+from sim.clock import VirtualClock
+
+
+class Pin:
+    def __init__(self, board: "Board", name: str) -> None:
+        self.board = board
+        self.clock = board.clock
+        self.name = name
+
+        # level driven from the outside, None if the pin is floating
+        self.level = None
+
+        # (timestamp, value) for every change of the output value
+        self.history = []
+
+        # keypad scanning the pin, if any
+        self.keys = None
+
+    def __repr__(self) -> str:
+        return f"board.{self.name}"
+
+    def set_level(self, level: bool | None) -> None:
+        self.level = level
+
+        if self.keys is not None:
+            self.keys.on_change(self)
+
+
+class Board:
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.pins = {f"GP{idx}": Pin(self, f"GP{idx}") for idx in range(29)}
+
+        # devices on the I2C bus, and the number of transactions for each address
+        self.i2c_devices = {}
+        self.i2c_transactions = {}
+
+        # LCD is not on the I2C bus, it is found using any of its pins
+        self.lcd = None
+
+        # (timestamp, counter, pin, level), sorted by timestamp
+        self.schedule = []
+        self.counter = 0
+
+    def reset(self) -> None:
+        # peripherals are released when the device is restarted
+        for pin in self.pins.values():
+            pin.keys = None
+
+    def set_level(self, pin: Pin, level: bool | None, at: float | None = None) -> None:
+        at = self.clock.now if at is None else at
+
+        self.schedule.append((at, self.counter, pin, level))
+        self.schedule.sort(key=lambda item: item[:2])
+        self.counter += 1
+
+        self.update()
+
+    def update(self) -> None:
+        while self.schedule and self.schedule[0][0] <= self.clock.now:
+            _, _, pin, level = self.schedule.pop(0)
+            pin.set_level(level)
+
+    def get_next_change(self, pins: dict, until: float) -> tuple | None:
+        # first scheduled change that sets any of the pins to the requested level
+        for at, _, pin, level in self.schedule:
+            if at > until:
+                break
+            if pin in pins and pins[pin] == level:
+                return at, pin
+
+        return None
+
+
+class DigitalInOut:
+    def __init__(self, pin: Pin) -> None:
+        self.pin = pin
+        self.direction = None
+        self.pull = None
+        self._value = False
+
+    @property
+    def value(self) -> bool:
+        if self.direction == Direction.OUTPUT:
+            return self._value
+        if self.pin.level is None:
+            return self.pull == Pull.UP
+        return self.pin.level
+
+    @value.setter
+    def value(self, value: bool) -> None:
+        self._value = value
+        self.pin.history.append((self.pin.clock.now, value))
+
+
+class Direction:
+    INPUT = 0
+    OUTPUT = 1
+
+
+class Pull:
+    UP = 0
+    DOWN = 1
+
+
+class PWMOut:
+    def __init__(self, pin: Pin, **_) -> None:
+        self.pin = pin
+        self._duty_cycle = 0
+
+    @property
+    def duty_cycle(self) -> int:
+        return self._duty_cycle
+
+    @duty_cycle.setter
+    def duty_cycle(self, value: int) -> None:
+        self._duty_cycle = value
+        self.pin.history.append((self.pin.clock.now, value))
+
+
+class I2C:
+    def __init__(self, scl: Pin, sda: Pin) -> None:
+        self.devices = scl.board.i2c_devices
+        self.transactions = scl.board.i2c_transactions
+        self.locked = False
+
+        _ = sda
+
+    def try_lock(self) -> bool:
+        if self.locked:
+            return False
+
+        self.locked = True
+        return True
+
+    def unlock(self) -> None:
+        self.locked = False
+
+    def scan(self) -> list[int]:
+        return sorted(self.devices)
+
+    def readfrom_into(
+        self, address: int, buffer: bytearray, *, start: int = 0, end: int = sys.maxsize
+    ) -> None:
+        end = min(end, len(buffer))
+        buffer[start:end] = self.transaction(address).read(end - start)
+
+    def writeto(
+        self, address: int, buffer, *, start: int = 0, end: int = sys.maxsize
+    ) -> None:
+        self.transaction(address).write(bytes(buffer[start:end]))
+
+    def writeto_then_readfrom(  # pylint:disable=too-many-arguments
+        self,
+        address: int,
+        out_buffer,
+        in_buffer: bytearray,
+        *,
+        out_start: int = 0,
+        out_end: int = sys.maxsize,
+        in_start: int = 0,
+        in_end: int = sys.maxsize,
+    ) -> None:
+        # repeated start, both parts are a single transaction
+        chip = self.transaction(address)
+        chip.write(bytes(out_buffer[out_start:out_end]))
+
+        in_end = min(in_end, len(in_buffer))
+        in_buffer[in_start:in_end] = chip.read(in_end - in_start)
+
+    def transaction(self, address: int) -> object:
+        if not self.locked:
+            raise RuntimeError("I2C bus is not locked")
+        if address not in self.devices:
+            raise OSError(f"No I2C device at {address:#x}")
+
+        self.transactions[address] = self.transactions.get(address, 0) + 1
+        return self.devices[address]
+
+
+class EEPROMChip:
+    SIZE = 4096
+    PAGE_SIZE = 32
+    WRITE_CYCLE = 0.005
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.data = bytearray(b"\xFF" * self.SIZE)
+
+        # number of bytes and write cycles, in total and for each page
+        self.bytes_written = 0
+        self.write_cycles = 0
+        self.page_writes = [0] * (self.SIZE // self.PAGE_SIZE)
+
+        self.busy_until = 0.0
+        self.address = 0
+
+    def check_ready(self) -> None:
+        # the chip does not acknowledge its address during the write cycle
+        if self.clock.now < self.busy_until:
+            raise OSError("EEPROM is busy")
+
+    def read(self, length: int) -> bytes:
+        self.check_ready()
+
+        # sequential read wraps around at the end of the memory
+        data = bytes(
+            self.data[(self.address + idx) % self.SIZE] for idx in range(length)
+        )
+        self.address = (self.address + length) % self.SIZE
+        return data
+
+    def write(self, data: bytes) -> None:
+        self.check_ready()
+
+        # two bytes of the address, followed by the data, if any
+        if len(data) < 2:
+            return
+
+        address = (data[0] * 256 + data[1]) % self.SIZE
+        self.address = address
+
+        data = data[2:]
+        if not data:
+            return
+
+        page = address // self.PAGE_SIZE
+        first = page * self.PAGE_SIZE
+
+        # address counter wraps around within the same page
+        for idx, value in enumerate(data):
+            self.data[first + (address - first + idx) % self.PAGE_SIZE] = value
+
+        self.bytes_written += len(data)
+        self.write_cycles += 1
+        self.page_writes[page] += 1
+        self.busy_until = self.clock.now + self.WRITE_CYCLE
+
+
+class EEPROM_I2C:  # pylint:disable=invalid-name
+    def __init__(self, i2c: I2C, address: int) -> None:
+        self._device = I2CDevice(i2c, address)
+
+    def __len__(self) -> int:
+        return EEPROMChip.SIZE
+
+    def __getitem__(self, key: int | slice) -> bytearray:
+        if isinstance(key, int):
+            key = slice(key, key + 1)
+
+        buffer = bytearray(key.stop - key.start)
+        with self._device as device:
+            device.write_then_readinto(
+                bytes((key.start // 256, key.start % 256)), buffer
+            )
+
+        return buffer
+
+    def __setitem__(self, key: int | slice, value) -> None:
+        if isinstance(key, int):
+            key, value = slice(key, key + 1), [value]
+
+        # data is written one byte at a time, but only if it was changed
+        if self[key] == bytes(value):
+            return
+
+        for idx, byte in enumerate(value[: key.stop - key.start]):
+            address = key.start + idx
+
+            with self._device as device:
+                device.write(bytes((address // 256, address % 256, byte)))
+
+            time.sleep(EEPROMChip.WRITE_CYCLE)
+
+
+class I2CDevice:
+    def __init__(self, i2c: I2C, device_address: int, probe: bool = True) -> None:
+        self.i2c = i2c
+        self.device_address = device_address
+
+        if probe:
+            with self:
+                self.i2c.writeto(device_address, b"")
+
+    def __enter__(self) -> "I2CDevice":
+        while not self.i2c.try_lock():
+            pass
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.i2c.unlock()
+
+    def readinto(
+        self, buffer: bytearray, *, start: int = 0, end: int | None = None
+    ) -> None:
+        end = len(buffer) if end is None else end
+        self.i2c.readfrom_into(self.device_address, buffer, start=start, end=end)
+
+    def write(self, buffer, *, start: int = 0, end: int | None = None) -> None:
+        end = len(buffer) if end is None else end
+        self.i2c.writeto(self.device_address, buffer, start=start, end=end)
+
+    def write_then_readinto(self, out_buffer, in_buffer: bytearray, **kwargs) -> None:
+        self.i2c.writeto_then_readfrom(
+            self.device_address, out_buffer, in_buffer, **kwargs
+        )
+
+
+def to_bcd(value: int) -> int:
+    return value // 10 * 16 + value % 10
+
+
+def from_bcd(value: int) -> int:
+    return value // 16 * 10 + value % 16
+
+
+class RTCChip:
+    # DS3231 only supports years from 2000 to 2099
+    DEFAULT_TIME = 946684800
+
+    REGISTER_COUNT = 0x13
+    TIME_REGISTERS = 7
+    STATUS = 0x0F
+    OSCILLATOR_STOPPED = 0x80
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.registers = bytearray(self.REGISTER_COUNT)
+        self.address = 0
+
+        self._time = self.DEFAULT_TIME
+        self._time_set = 0.0
+
+    @property
+    def lost_power(self) -> bool:
+        return bool(self.registers[self.STATUS] & self.OSCILLATOR_STOPPED)
+
+    @lost_power.setter
+    def lost_power(self, value: bool) -> None:
+        if value:
+            self.registers[self.STATUS] |= self.OSCILLATOR_STOPPED
+        else:
+            self.registers[self.STATUS] &= ~self.OSCILLATOR_STOPPED
+
+    def get_time(self) -> int:
+        return self._time + int(self.clock.now - self._time_set)
+
+    def set_time(self, value: int) -> None:
+        self._time = value
+        self._time_set = self.clock.now
+
+    def read(self, length: int) -> bytes:
+        now = time.localtime(self.get_time())
+        values = (now.tm_sec, now.tm_min, now.tm_hour, now.tm_wday + 1)
+        values += (now.tm_mday, now.tm_mon, now.tm_year - 2000)
+        self.registers[: self.TIME_REGISTERS] = bytes(to_bcd(v) for v in values)
+
+        data = bytes(
+            self.registers[(self.address + idx) % self.REGISTER_COUNT]
+            for idx in range(length)
+        )
+        self.address = (self.address + length) % self.REGISTER_COUNT
+        return data
+
+    def write(self, data: bytes) -> None:
+        # register address, followed by the data, if any
+        if not data:
+            return
+
+        self.address = data[0] % self.REGISTER_COUNT
+        time_changed = False
+
+        for value in data[1:]:
+            self.registers[self.address] = value
+            time_changed |= self.address < self.TIME_REGISTERS
+            self.address = (self.address + 1) % self.REGISTER_COUNT
+
+        if time_changed:
+            sec, minute, hour, _, day, month, year = (
+                from_bcd(v) for v in self.registers[: self.TIME_REGISTERS]
+            )
+            values = (2000 + year, month, day, hour, minute, sec, 0, 0, -1)
+            self.set_time(int(time.mktime(values)))
+
+
+class DS3231:
+    ADDRESS = 0x68
+
+    CONTROL = 0x0E
+    STATUS = 0x0F
+
+    def __init__(self, i2c: I2C) -> None:
+        self._device = I2CDevice(i2c, self.ADDRESS)
+
+    @property
+    def datetime(self) -> time.struct_time:
+        sec, minute, hour, wday, day, month, year = (
+            from_bcd(v) for v in self._read(0x00, 7)
+        )
+        return time.struct_time(
+            (2000 + year, month, day, hour, minute, sec, wday - 1, -1, -1)
+        )
+
+    @datetime.setter
+    def datetime(self, value: time.struct_time) -> None:
+        values = (value.tm_sec, value.tm_min, value.tm_hour, value.tm_wday + 1)
+        values += (value.tm_mday, value.tm_mon, value.tm_year - 2000)
+        self._write(0x00, bytes(to_bcd(v) for v in values))
+
+        # oscillator is enabled, and the flag is cleared, like in the real driver
+        self._set_bit(self.CONTROL, 7, False)
+        self._set_bit(self.STATUS, 7, False)
+
+    @property
+    def lost_power(self) -> bool:
+        return bool(self._read(self.STATUS, 1)[0] & 0x80)
+
+    def _read(self, register: int, length: int) -> bytearray:
+        buffer = bytearray(length)
+        with self._device as device:
+            device.write_then_readinto(bytes((register,)), buffer)
+        return buffer
+
+    def _write(self, register: int, data: bytes) -> None:
+        with self._device as device:
+            device.write(bytes((register,)) + data)
+
+    def _set_bit(self, register: int, bit: int, value: bool) -> None:
+        data = self._read(register, 1)[0]
+        data = data | 1 << bit if value else data & ~(1 << bit)
+        self._write(register, bytes((data,)))
+
+
+class LCDChip:  # pylint:disable=too-many-instance-attributes
+    WIDTH = 16
+    HEIGHT = 2
+    ROW_OFFSETS = (0x00, 0x40)
+
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.ddram = bytearray(b" " * 0x80)
+        self.cgram = bytearray(64)
+
+        self.address = 0
+        self.cgram_mode = False
+
+        self.commands = 0
+        self.data_bytes = 0
+
+        # (timestamp, rows) for every change of the visible content,
+        # changes made at the same time are merged together
+        self.frames = []
+
+    @property
+    def rows(self) -> list[bytes]:
+        return [
+            bytes(self.ddram[offset : offset + self.WIDTH])
+            for offset in self.ROW_OFFSETS[: self.HEIGHT]
+        ]
+
+    @property
+    def text(self) -> list[str]:
+        # custom characters are shown as their slot number
+        return [
+            "".join(chr(b) if b >= 32 else f"{b % 8}" for b in row) for row in self.rows
+        ]
+
+    def get_glyph(self, col: int, row: int) -> tuple[int, ...] | None:
+        code = self.ddram[self.ROW_OFFSETS[row] + col]
+        if code >= 16:
+            return None
+
+        first = code % 8 * 8
+        return tuple(self.cgram[first : first + 8])
+
+    def command(self, value: int) -> None:
+        self.commands += 1
+
+        if value & 0x80:
+            self.address = value & 0x7F
+            self.cgram_mode = False
+        elif value & 0x40:
+            self.address = value & 0x3F
+            self.cgram_mode = True
+        elif value == 0x01:
+            self.ddram[:] = b" " * len(self.ddram)
+            self.address = 0
+            self.cgram_mode = False
+            self.add_frame()
+
+    def data(self, value: int) -> None:
+        self.data_bytes += 1
+
+        if self.cgram_mode:
+            self.cgram[self.address] = value & 0x1F
+            self.address = (self.address + 1) % len(self.cgram)
+        else:
+            self.ddram[self.address] = value
+            self.address = (self.address + 1) % len(self.ddram)
+            self.add_frame()
+
+    def add_frame(self) -> None:
+        if self.frames and self.frames[-1][0] == self.clock.now:
+            self.frames.pop()
+
+        self.frames.append((self.clock.now, self.rows))
+
+
+class Character_LCD_Mono:  # pylint:disable=invalid-name
+    def __init__(self, rs: DigitalInOut, **_) -> None:
+        self.chip = rs.pin.board.lcd
+
+    def _write8(self, value: int, char_mode: bool = False) -> None:
+        if char_mode:
+            self.chip.data(value)
+        else:
+            self.chip.command(value)
+
+    def cursor_position(self, column: int, row: int) -> None:
+        self._write8(0x80 | (column + LCDChip.ROW_OFFSETS[row]))
+
+    def create_char(self, location: int, pattern: tuple[int, ...]) -> None:
+        location &= 0x7
+        self._write8(0x40 | (location << 3))
+
+        for value in pattern:
+            self._write8(value, True)
+
+    def clear(self) -> None:
+        self._write8(0x01)
+
+
+class Event:
+    def __init__(self, key_number: int = 0, pressed: bool = True) -> None:
+        self.key_number = key_number
+        self.pressed = pressed
+        self.timestamp = 0
+
+
+class EventQueue:
+    def __init__(self, keys: "Keys", max_events: int) -> None:
+        self.keys = keys
+        self.max_events = max_events
+        self.events = []
+        self.overflowed = False
+
+    def __len__(self) -> int:
+        self.keys.scan()
+        return len(self.events)
+
+    def append(self, key_number: int, pressed: bool, timestamp: int) -> None:
+        if len(self.events) >= self.max_events:
+            self.overflowed = True
+            return
+
+        self.events.append((key_number, pressed, timestamp))
+
+    def get(self) -> Event | None:
+        event = Event()
+        return event if self.get_into(event) else None
+
+    def get_into(self, event: Event) -> bool:
+        self.keys.scan()
+
+        if not self.events:
+            return False
+
+        event.key_number, event.pressed, event.timestamp = self.events.pop(0)
+        return True
+
+
+class Keys:
+    def __init__(
+        self, pins: tuple[Pin, ...], value_when_pressed: bool, max_events: int = 64
+    ) -> None:
+        self.pins = list(pins)
+        self.value_when_pressed = value_when_pressed
+        self.events = EventQueue(self, max_events)
+
+        self.board = pins[0].board
+        self.pressed = [False] * len(self.pins)
+
+        for pin in self.pins:
+            if pin.keys is not None:
+                raise ValueError(f"{pin} in use")
+            pin.keys = self
+
+        # keys held during initialization are reported as pressed
+        for pin in self.pins:
+            self.on_change(pin)
+
+    def deinit(self) -> None:
+        for pin in self.pins:
+            pin.keys = None
+        self.pins = []
+
+    def scan(self) -> None:
+        self.board.update()
+
+    def on_change(self, pin: Pin) -> None:
+        key_number = self.pins.index(pin)
+        pressed = pin.level is not None and pin.level == self.value_when_pressed
+
+        if pressed != self.pressed[key_number]:
+            self.pressed[key_number] = pressed
+            self.events.append(key_number, pressed, pin.board.clock.ticks_ms())
+
+
+class Watchdog:
+    def __init__(self, clock: VirtualClock) -> None:
+        self.clock = clock
+        self.timeout = 0.0
+        self._mode = None
+
+        self.last_feed = 0.0
+        self.max_gap = 0.0
+
+        clock.callbacks.append(self.check)
+
+    @property
+    def mode(self) -> int | None:
+        return self._mode
+
+    @mode.setter
+    def mode(self, value: int | None) -> None:
+        # the countdown is started when the watchdog is enabled
+        self._mode = value
+        self.last_feed = self.clock.now
+
+    def feed(self) -> None:
+        self.check()
+        self.last_feed = self.clock.now
+
+    def reset(self) -> None:
+        self.timeout = 0.0
+        self._mode = None
+
+    def check(self) -> None:
+        if self._mode is None:
+            return
+
+        gap = self.clock.now - self.last_feed
+        self.max_gap = max(self.max_gap, gap)
+
+        if gap > self.timeout:
+            raise WatchDogTimeout(f"Watchdog not fed for {gap:.3f} s")
+
+
+class WatchDogTimeout(Exception):
+    pass
+
+
+class WatchDogMode:
+    RAISE = 1
+    RESET = 2
+
+
+class TimeAlarm:
+    def __init__(self, monotonic_time: float) -> None:
+        self.monotonic_time = monotonic_time
+
+
+class PinAlarm:
+    def __init__(
+        self, pin: Pin, value: bool, edge: bool = False, pull: bool = False
+    ) -> None:
+        if pin.keys is not None:
+            raise ValueError(f"{pin} in use")
+
+        self.pin = pin
+        self.value = value
+        self.edge = edge
+        self.pull = pull
+
+
+class Serial:
+    def __init__(self) -> None:
+        self.buffer = ""
+        self.connected = False
+
+    def write(self, text: str) -> None:
+        # data can only be received from the connected host
+        self.connected = True
+        self.buffer += text
+
+    def read(self, size: int = 1) -> str:
+        text, self.buffer = self.buffer[:size], self.buffer[size:]
+        return text
+
+
+class Runtime:
+    def __init__(self, serial: Serial) -> None:
+        self.serial = serial
+
+    @property
+    def serial_connected(self) -> bool:
+        return self.serial.connected
+
+    @property
+    def serial_bytes_available(self) -> int:
+        return len(self.serial.buffer)
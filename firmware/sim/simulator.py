@@ -0,0 +1,292 @@
+import asyncio
+import importlib
+import math
+import sys
+import time
+import types
+
+from sim.clock import VirtualClock, VirtualEventLoop, ticks_add, ticks_diff
+from sim.hardware import (
+    DS3231,
+    EEPROM_I2C,
+    I2C,
+    Board,
+    Character_LCD_Mono,
+    DigitalInOut,
+    Direction,
+    EEPROMChip,
+    Event,
+    I2CDevice,
+    Keys,
+    LCDChip,
+    Pin,
+    PinAlarm,
+    Pull,
+    PWMOut,
+    RTCChip,
+    Runtime,
+    Serial,
+    TimeAlarm,
+    Watchdog,
+    WatchDogMode,
+    WatchDogTimeout,
+)
+
+EEPROM_ADDRESS = 0x57
+RTC_ADDRESS = 0x68
+
+HOST_MKTIME = time.mktime
+
+# hardware is initialized when these modules are imported, so they are imported
+# again on every boot
+FIRMWARE_MODULES = (
+    "app.boot",
+    "app.bus",
+    "app.clock",
+    "app.console",
+    "app.core",
+    "app.display",
+    "app.eeprom",
+    "app.keys",
+    "app.logger",
+    "app.menu",
+    "app.motor",
+    "app.power",
+    "app.profiler",
+    "app.scheduler",
+    "app.settings",
+    "app.watchdog",
+)
+
+
+def mktime(values) -> int:
+    # CircuitPython has integer timestamps
+    return int(HOST_MKTIME(values))
+
+
+class Simulator:  # pylint:disable=too-many-instance-attributes
+    def __init__(self, monkeypatch) -> None:
+        self.monkeypatch = monkeypatch
+
+        self.clock = VirtualClock()
+        self.board = Board(self.clock)
+        self.eeprom = EEPROMChip(self.clock)
+        self.rtc = RTCChip(self.clock)
+        self.lcd = LCDChip(self.clock)
+        self.watchdog = Watchdog(self.clock)
+        self.serial = Serial()
+
+        self.board.i2c_devices[EEPROM_ADDRESS] = self.eeprom
+        self.board.i2c_devices[RTC_ADDRESS] = self.rtc
+        self.board.lcd = self.lcd
+
+        self.loop = None
+        self.task = None
+        self.end_time = math.inf
+        self.core = None
+        self.menu = None
+
+        self.install()
+
+    def install(self) -> None:
+        for name, module in self.get_modules().items():
+            self.monkeypatch.setitem(sys.modules, name, module)
+
+        for name in ("monotonic", "monotonic_ns", "sleep"):
+            self.monkeypatch.setattr(time, name, getattr(self.clock, name))
+        self.monkeypatch.setattr(time, "mktime", mktime)
+
+        self.monkeypatch.setattr(sys, "stdin", self.serial)
+        self.monkeypatch.setenv("TZ", "UTC")
+        time.tzset()
+
+        # LANG is also set by the host locale, e.g. to en_US.UTF-8
+        self.monkeypatch.setenv("LANG", "en")
+
+    def close(self) -> None:
+        if self.loop:
+            self.stop()
+            asyncio.set_event_loop(None)
+
+        for name in FIRMWARE_MODULES:
+            sys.modules.pop(name, None)
+
+        self.monkeypatch.undo()
+        time.tzset()
+
+        # settings could have been changed by the environment variables
+        importlib.reload(importlib.import_module("app.const"))
+
+    def get_modules(self) -> dict[str, types.ModuleType]:
+        modules = {
+            "adafruit_24lc32": {"EEPROM_I2C": EEPROM_I2C},
+            "adafruit_bus_device": {},
+            "adafruit_bus_device.i2c_device": {"I2CDevice": I2CDevice},
+            "adafruit_character_lcd": {},
+            "adafruit_character_lcd.character_lcd": {
+                "Character_LCD_Mono": Character_LCD_Mono
+            },
+            "adafruit_ds3231": {"DS3231": DS3231},
+            "adafruit_ticks": {
+                "ticks_add": ticks_add,
+                "ticks_diff": ticks_diff,
+                "ticks_ms": self.clock.ticks_ms,
+            },
+            "alarm": {"light_sleep_until_alarms": self.light_sleep_until_alarms},
+            "alarm.pin": {"PinAlarm": PinAlarm},
+            "alarm.time": {"TimeAlarm": TimeAlarm},
+            "board": self.board.pins,
+            "busio": {"I2C": I2C},
+            "digitalio": {
+                "DigitalInOut": DigitalInOut,
+                "Direction": Direction,
+                "Pull": Pull,
+            },
+            "keypad": {"Event": Event, "Keys": Keys},
+            "microcontroller": {"watchdog": self.watchdog},
+            "pwmio": {"PWMOut": PWMOut},
+            "rtc": {"set_time_source": lambda source: None},
+            "supervisor": {
+                "runtime": Runtime(self.serial),
+                "ticks_ms": self.clock.ticks_ms,
+            },
+            "watchdog": {
+                "WatchDogMode": WatchDogMode,
+                "WatchDogTimeout": WatchDogTimeout,
+            },
+        }
+
+        result = {}
+        for name, attributes in modules.items():
+            result[name] = types.ModuleType(name)
+            result[name].__dict__.update(attributes)
+
+        # submodules are also available as attributes of their parent
+        for name, module in result.items():
+            if "." in name:
+                parent, child = name.rsplit(".", 1)
+                setattr(result[parent], child, module)
+
+        return result
+
+    def stop(self) -> None:
+        # watchdog is not running while the device is being restarted
+        self.watchdog.reset()
+        self.task.cancel()
+
+        try:
+            self.loop.run_until_complete(self.task)
+        except asyncio.CancelledError:
+            pass
+
+        self.loop.close()
+
+    def boot(self, **settings) -> None:
+        # settings.toml values are read by the firmware as environment variables
+        for key, value in settings.items():
+            self.monkeypatch.setenv(key, str(value))
+
+        importlib.reload(importlib.import_module("app.const"))
+
+        if self.loop:
+            self.stop()
+
+        for name in FIRMWARE_MODULES:
+            sys.modules.pop(name, None)
+
+        self.board.reset()
+        self.watchdog.reset()
+
+        self.loop = VirtualEventLoop(self.clock)
+        asyncio.set_event_loop(self.loop)
+
+        self.core = importlib.import_module("app.core")
+        self.menu = importlib.import_module("app.menu")
+
+        app = importlib.import_module("app")
+        self.task = self.loop.create_task(app.main())
+
+        # settings and the log are loaded in the background, after the first frame
+        self.loop.run_until_complete(self.core.boot.ready.wait())
+
+    def run(self, seconds: float) -> None:
+        self.end_time = self.clock.now + seconds
+
+        # the end time must not depend on when the first callback is run
+        future = self.loop.create_future()
+        self.loop.call_at(self.end_time, future.set_result, None)
+
+        try:
+            self.loop.run_until_complete(future)
+        finally:
+            self.end_time = math.inf
+
+        if self.task.done():
+            self.task.result()
+
+    def set_time(self, *values: int) -> None:
+        # year, month, day, hour, minute, second
+        values += (0,) * (6 - len(values))
+        self.rtc.set_time(int(time.mktime(values + (0, 0, -1))))
+
+    def get_pin(self, name: str) -> Pin:
+        return self.board.pins[name]
+
+    def get_pulses(self, pin: Pin) -> list[tuple[float, float]]:
+        # (start, end) for every time the output was high
+        pulses = []
+        start = None
+
+        for at, value in pin.history:
+            if value and start is None:
+                start = at
+            elif not value and start is not None:
+                pulses.append((start, at))
+                start = None
+
+        return pulses
+
+    def press(self, pin: Pin, at: float | None = None) -> None:
+        self.board.set_level(pin, False, at)
+
+    def release(self, pin: Pin, at: float | None = None) -> None:
+        self.board.set_level(pin, None, at)
+
+    def hold(self, pin: Pin, duration: float, at: float | None = None) -> None:
+        at = self.clock.now if at is None else at
+
+        self.press(pin, at)
+        self.release(pin, at + duration)
+
+    def light_sleep_until_alarms(self, *alarms) -> TimeAlarm | PinAlarm:
+        time_alarms = [a for a in alarms if isinstance(a, TimeAlarm)]
+        pin_alarms = {a.pin: a for a in alarms if isinstance(a, PinAlarm)}
+
+        self.board.update()
+        self.clock.wakeups += 1
+
+        # pin alarms are level-triggered
+        for pin, alarm in pin_alarms.items():
+            if pin.level is not None and pin.level == alarm.value:
+                return alarm
+
+        deadline = min((a.monotonic_time for a in time_alarms), default=math.inf)
+
+        # wake up when the simulation is stopped, the device will go to sleep again
+        if deadline > self.end_time:
+            self.clock.advance(max(self.end_time - self.clock.now, 0))
+            return TimeAlarm(self.clock.now)
+        levels = {pin: alarm.value for pin, alarm in pin_alarms.items()}
+
+        change = self.board.get_next_change(levels, deadline)
+        if change:
+            at, pin = change
+            self.clock.advance(at - self.clock.now)
+            self.board.update()
+            return pin_alarms[pin]
+
+        if deadline == math.inf:
+            raise RuntimeError("Device would sleep forever")
+
+        self.clock.advance(deadline - self.clock.now)
+        return min(time_alarms, key=lambda a: a.monotonic_time)
@@ -0,0 +1,115 @@
+import os
+
+from app import const
+
+# texts are stored on the device in the compiled form, only the selected language
+# is loaded; run this script after changing any of them
+
+OUTPUT_DIR = os.path.join(os.path.dirname(__file__), "app", "lang")
+
+# text ID is a single byte, as it is also used as the message ID in log frames
+TEXT_COUNT = 256
+
+TRANSLATIONS = {
+    "en": {
+        const.BOARD_INIT: "Device start",
+        const.RTC_SAVE: "Clock updated",
+        const.SETTINGS_ERROR: "Settings error",
+        const.SETTINGS_SAVE: "Settings updated",
+        const.SETTINGS_RESET: "Factory settings",
+        const.SETTINGS_REPAIR: "Settings fixed",
+        const.SCHEDULER_INIT: "Scheduler start",
+        const.SCHEDULER_ERROR: "Clock error",
+        const.ACT_OPEN_START: "Opening (1)",
+        const.ACT_OPEN_START_AUTO: "Opening (A)",
+        const.ACT_OPEN_START_MEASURE: "Opening (M)",
+        const.ACT_OPEN_STOP: "Opened",
+        const.ACT_CLOSE_START: "Closing (1)",
+        const.ACT_CLOSE_START_AUTO: "Closing (A)",
+        const.ACT_CLOSE_START_MEASURE: "Closing (M)",
+        const.ACT_CLOSE_STOP: "Closed",
+        const.TASK_TIMEOUT: "Hang: scheduler",
+        const.TASK_TIMEOUT_MENU: "Hang: menu",
+        const.TASK_TIMEOUT_LOGGER: "Hang: log",
+        const.TASK_TIMEOUT_MOTOR: "Hang: motor",
+        const.LOOP_LAG: "Delay: scheduler",
+        const.LOOP_LAG_MENU: "Delay: menu",
+        const.LOOP_LAG_LOGGER: "Delay: log",
+        const.LOOP_LAG_MOTOR: "Delay: motor",
+        const.INVALID: "(empty)",
+        const.MENU_PREVIEW: "Preview",
+        const.MENU_OPEN: "Open",
+        const.MENU_CLOSE: "Close",
+        const.MENU_SET_OPEN: "Set opening",
+        const.MENU_SET_CLOSE: "Set closing",
+        const.MENU_SET_TIME: "Set clock",
+        const.MENU_HISTORY: "History",
+        const.MENU_RETURN: "Return",
+    },
+    "pl": {
+        const.BOARD_INIT: "Start urzadzenia",
+        const.RTC_SAVE: "Zmiana czasu",
+        const.SETTINGS_ERROR: "Blad ustawien",
+        const.SETTINGS_SAVE: "Zmiana ustawien",
+        const.SETTINGS_RESET: "Ustaw.fabryczne",
+        const.SETTINGS_REPAIR: "Napr. ustawien",
+        const.SCHEDULER_INIT: "Start planisty",
+        const.SCHEDULER_ERROR: "Blad zegara",
+        const.ACT_OPEN_START: "Otwieranie (1)",
+        const.ACT_OPEN_START_AUTO: "Otwieranie (A)",
+        const.ACT_OPEN_START_MEASURE: "Otwieranie (M)",
+        const.ACT_OPEN_STOP: "Otworzono",
+        const.ACT_CLOSE_START: "Zamykanie (1)",
+        const.ACT_CLOSE_START_AUTO: "Zamykanie (A)",
+        const.ACT_CLOSE_START_MEASURE: "Zamykanie (M)",
+        const.ACT_CLOSE_STOP: "Zamknieto",
+        const.TASK_TIMEOUT: "Awaria: planista",
+        const.TASK_TIMEOUT_MENU: "Awaria: menu",
+        const.TASK_TIMEOUT_LOGGER: "Awaria: dziennik",
+        const.TASK_TIMEOUT_MOTOR: "Awaria: silnik",
+        const.LOOP_LAG: "Opozn.: planista",
+        const.LOOP_LAG_MENU: "Opozn.: menu",
+        const.LOOP_LAG_LOGGER: "Opozn.: dziennik",
+        const.LOOP_LAG_MOTOR: "Opozn.: silnik",
+        const.INVALID: "(pusty)",
+        const.MENU_PREVIEW: "Podglad",
+        const.MENU_OPEN: "Otworz",
+        const.MENU_CLOSE: "Zamknij",
+        const.MENU_SET_OPEN: "Ust.otwierania",
+        const.MENU_SET_CLOSE: "Ust.zamykania",
+        const.MENU_SET_TIME: "Ust.zegara",
+        const.MENU_HISTORY: "Historia",
+        const.MENU_RETURN: "Powrot",
+    },
+}
+
+
+def compile_texts(texts: dict[int, str]) -> bytes:
+    # offset table has one more entry than texts, so the end of each text
+    # is the start of the next one
+    first = (TEXT_COUNT + 1) * 2
+    table = bytearray()
+    data = bytearray()
+
+    for text_id in range(TEXT_COUNT):
+        table += (first + len(data)).to_bytes(2, "little")
+        data += texts.get(text_id, "").encode("ascii")
+
+    table += (first + len(data)).to_bytes(2, "little")
+    return bytes(table + data)
+
+
+def get_path(lang: str) -> str:
+    return os.path.join(OUTPUT_DIR, f"{lang}.bin")
+
+
+def main() -> None:
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    for lang, texts in TRANSLATIONS.items():
+        with open(get_path(lang), "wb") as f:
+            f.write(compile_texts(texts))
+
+
+if __name__ == "__main__":
+    main()
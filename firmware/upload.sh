@@ -32,11 +32,14 @@ then
   exit 1
 fi
 
+python3 translations.py
+
 find app -name '*.py' -exec ./mpy-cross {} \;
 find lib -name '*.py' -exec ./mpy-cross {} \;
 
 mkdir -p "$CPY_HOME/app" "$CPY_HOME/lib"
 rsync -crv --include="*/" --include="*.mpy" --exclude="*" app/*.mpy "$CPY_HOME/app/"
+rsync -crv app/lang "$CPY_HOME/app/"
 rsync -crv --include="*/" --include="*.mpy" --exclude="*" "${LIB_FILES[@]}" "$CPY_HOME/lib/"
 rsync -crv boot.py code.py safemode.py "$CPY_HOME/"
 sync